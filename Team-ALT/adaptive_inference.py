@@ -0,0 +1,112 @@
+# adaptive_inference.py
+import cv2
+import numpy as np
+
+# Taille de la vignette utilisée pour mesurer le mouvement entre deux images
+PROBE_SIZE = (64, 48)
+
+
+class AdaptiveScheduler:
+    """Decides per frame whether full pose inference is needed.
+
+    A frame is inferred when the image changed enough since the last
+    inferred frame (mean absolute difference of a small grayscale probe),
+    when recent landmarks moved fast, or after `max_skip` skipped frames in
+    a row. Skipped frames get landmarks extrapolated at constant velocity
+    from the last two inferred frames.
+    """
+
+    def __init__(self, max_skip: int = 1, motion_threshold: float = 4.0, speed_threshold: float = 0.15):
+        self.max_skip = max_skip
+        self.motion_threshold = motion_threshold
+        self.speed_threshold = speed_threshold  # unités normalisées de l'image par seconde
+
+        self.inferred = 0
+        self.skipped = 0
+        self._skip_run = 0
+        self._probe = np.empty(PROBE_SIZE[::-1], dtype=np.uint8)
+        self._small = np.empty(PROBE_SIZE[::-1] + (3,), dtype=np.uint8)
+        self._reference = None
+        self._last = None
+        self._last_time = 0.0
+        self._velocity = np.zeros((33, 2), dtype=np.float32)
+        self._speed = 0.0
+
+    def _motion_energy(self, frame) -> float:
+        cv2.resize(frame, PROBE_SIZE, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._probe)
+        if self._reference is None:
+            return float("inf")
+        return float(cv2.norm(self._probe, self._reference, cv2.NORM_L1)) / self._probe.size
+
+    def should_infer(self, frame) -> bool:
+        """Return True if this frame needs a real pose.process() call"""
+        motion = self._motion_energy(frame)
+        if (
+            self.max_skip <= 0
+            or self._last is None
+            or self._skip_run >= self.max_skip
+            or motion > self.motion_threshold
+            or self._speed > self.speed_threshold
+        ):
+            return True
+        return False
+
+    def observe(self, landmarks, timestamp: float):
+        """Record the result of a real inference"""
+        self.inferred += 1
+        self._skip_run = 0
+        if self._reference is None:
+            self._reference = self._probe.copy()
+        else:
+            np.copyto(self._reference, self._probe)
+        if landmarks is None:
+            self._last = None
+            self._speed = 0.0
+            return
+        if self._last is not None and timestamp > self._last_time:
+            dt = timestamp - self._last_time
+            np.subtract(landmarks[:, :2], self._last[:, :2], out=self._velocity)
+            self._velocity /= dt
+            visible = landmarks[:, 3] >= 0.5
+            self._speed = float(np.abs(self._velocity[visible]).max()) if visible.any() else 0.0
+        else:
+            self._velocity[:] = 0.0
+        self._last = landmarks
+        self._last_time = timestamp
+
+    def extrapolate(self, timestamp: float):
+        """Constant-velocity landmarks for a skipped frame"""
+        self.skipped += 1
+        self._skip_run += 1
+        landmarks = self._last.copy()
+        landmarks[:, :2] += self._velocity * (timestamp - self._last_time)
+        return landmarks
+
+    @property
+    def skip_ratio(self) -> float:
+        total = self.inferred + self.skipped
+        return self.skipped / total if total else 0.0
+
+
+class AdaptiveInference:
+    """Pipeline `process` stage that only runs `estimate(frame, timestamp)` when the scheduler asks for it.
+
+    With a `recorder` (LandmarkRecorder), every real inference result is
+    appended to it; extrapolated frames are not detections and are never
+    recorded.
+    """
+
+    def __init__(self, estimate, scheduler: AdaptiveScheduler, recorder=None):
+        self.estimate = estimate
+        self.scheduler = scheduler
+        self.recorder = recorder
+
+    def __call__(self, frame, timestamp):
+        if self.scheduler.should_infer(frame):
+            landmarks = self.estimate(frame, timestamp)
+            self.scheduler.observe(landmarks, timestamp)
+            if self.recorder is not None:
+                self.recorder.append(timestamp, landmarks)
+            return landmarks
+        return self.scheduler.extrapolate(timestamp)
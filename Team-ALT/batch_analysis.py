@@ -0,0 +1,206 @@
+# batch_analysis.py
+"""Offline rep counting for recorded workout videos.
+
+Runs the same pose + ExerciseEngine logic as the live trackers, without a
+webcam or Streamlit, and fans the videos out over a process pool with one
+MediaPipe Pose per worker.
+
+    python batch_analysis.py clips/ --exercise Squats --out results/ --workers 8
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from exercise_engine import ExerciseEngine
+from exercises import EXERCISES
+from landmark_filter import OneEuroFilter
+from landmark_recording import LandmarkRecorder
+from pose_angles import landmarks_to_array
+from pose_angles import PoseAngles
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".webm", ".m4v")
+
+# Instance Pose propre à chaque processus worker
+_worker_pose = None
+
+
+def create_pose(model_complexity: int = 1):
+    """Build a MediaPipe Pose in video (tracking) mode"""
+    import mediapipe as mp
+    return mp.solutions.pose.Pose(static_image_mode=False, model_complexity=model_complexity)
+
+
+def _init_worker(model_complexity: int):
+    global _worker_pose
+    cv2.setNumThreads(1)  # Un cœur par worker, pas de sur-souscription
+    _worker_pose = create_pose(model_complexity)
+
+
+def find_videos(video_dir: str) -> list:
+    """List the video files of a directory, sorted by name"""
+    return sorted(
+        os.path.join(video_dir, name)
+        for name in os.listdir(video_dir)
+        if name.lower().endswith(VIDEO_EXTENSIONS)
+    )
+
+
+def write_angle_trace(path: str, names: tuple, timestamps: list, angles: list):
+    """Write one row per frame with a detected pose: frame time then every joint angle"""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp"] + list(names))
+        for timestamp, row in zip(timestamps, angles):
+            writer.writerow([f"{timestamp:.3f}"] + [f"{value:.1f}" for value in row])
+
+
+def analyze_video(path: str, exercise: str, out_dir: str = None, pose=None, mirror: bool = True,
+                  record: bool = False) -> dict:
+    """Count reps in one recorded video and return its summary.
+
+    Timestamps come from the video frame rate, so hold rules measure video
+    time rather than processing time. When `out_dir` is given, the angle
+    trace and summary are written there as <name>_angles.csv / <name>.json,
+    plus the raw landmarks as <name>.lmk if `record` is set.
+    """
+    definition = EXERCISES[exercise]
+    engine = ExerciseEngine(definition)
+    pose_angles = PoseAngles()
+    smoother = OneEuroFilter.for_exercise(definition)
+    pose = pose if pose is not None else create_pose()
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    recorder = LandmarkRecorder(os.path.join(out_dir, f"{stem}.lmk")) if (record and out_dir) else None
+
+    timestamps = []
+    trace = []
+    frame_index = 0
+    started = time.perf_counter()
+
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if mirror:
+            frame = cv2.flip(frame, 1)  # Même orientation que les trackers webcam
+
+        timestamp = frame_index / fps
+        results = pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        landmarks = landmarks_to_array(results.pose_landmarks) if results.pose_landmarks else None
+        if recorder is not None:
+            recorder.append(timestamp, landmarks)
+        landmarks = smoother(landmarks, timestamp)
+        if landmarks is not None:
+            angles = pose_angles.update_array(landmarks)
+            engine.step(angles, timestamp)
+            timestamps.append(timestamp)
+            trace.append(angles.copy())
+        frame_index += 1
+
+    cap.release()
+    if recorder is not None:
+        recorder.close()
+    elapsed = time.perf_counter() - started
+    duration = frame_index / fps
+
+    summary = {
+        "video": os.path.basename(path),
+        "exercise": definition.name,
+        "frames": frame_index,
+        "frames_with_pose": len(trace),
+        "duration_s": round(duration, 2),
+        "processing_s": round(elapsed, 2),
+        "realtime_factor": round(duration / elapsed, 2) if elapsed > 0 else None,
+        "counts": {rule.name: state.count for rule, state in zip(definition.rules, engine.states)},
+        "total_reps": engine.total_count,
+    }
+
+    if out_dir:
+        write_angle_trace(os.path.join(out_dir, f"{stem}_angles.csv"), pose_angles.names, timestamps, trace)
+        with open(os.path.join(out_dir, f"{stem}.json"), "w") as f:
+            json.dump(summary, f, indent=2)
+
+    return summary
+
+
+def _analyze_in_worker(path: str, exercise: str, out_dir: str, mirror: bool, record: bool) -> dict:
+    try:
+        return analyze_video(path, exercise, out_dir, pose=_worker_pose, mirror=mirror, record=record)
+    except Exception as e:
+        return {"video": os.path.basename(path), "exercise": exercise, "error": str(e)}
+
+
+def analyze_directory(video_dir: str, exercise: str, out_dir: str, workers: int = None,
+                      model_complexity: int = 1, mirror: bool = True, record: bool = False,
+                      progress=None) -> list:
+    """Analyze every video of `video_dir` in parallel and write a summary.csv next to the per-video files"""
+    if exercise not in EXERCISES:
+        raise ValueError(f"Unknown exercise '{exercise}'. Choose from: {', '.join(EXERCISES)}")
+
+    videos = find_videos(video_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    summaries = []
+    # "spawn" : chaque worker démarre propre, sans threads MediaPipe hérités d'un fork
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(model_complexity,)) as executor:
+        futures = [executor.submit(_analyze_in_worker, path, exercise, out_dir, mirror, record) for path in videos]
+        for future in as_completed(futures):
+            summary = future.result()
+            summaries.append(summary)
+            if progress is not None:
+                progress(summary, len(summaries), len(videos))
+
+    summaries.sort(key=lambda s: s["video"])
+    write_summary(os.path.join(out_dir, "summary.csv"), summaries)
+    return summaries
+
+
+def write_summary(path: str, summaries: list):
+    """Write one line per video with its rep count (or error)"""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["video", "exercise", "total_reps", "counts", "duration_s", "processing_s", "realtime_factor", "error"])
+        for s in summaries:
+            writer.writerow([
+                s["video"], s["exercise"], s.get("total_reps", ""),
+                json.dumps(s.get("counts", {})), s.get("duration_s", ""),
+                s.get("processing_s", ""), s.get("realtime_factor", ""), s.get("error", ""),
+            ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count reps in a directory of recorded workout videos.")
+    parser.add_argument("video_dir", help="Directory containing the videos to analyze")
+    parser.add_argument("--exercise", required=True, choices=list(EXERCISES), help="Exercise performed in the videos")
+    parser.add_argument("--out", default="batch_results", help="Output directory (default: batch_results)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--model-complexity", type=int, default=1, choices=(0, 1, 2))
+    parser.add_argument("--no-mirror", action="store_true", help="Do not flip frames horizontally like the webcam trackers")
+    parser.add_argument("--record", action="store_true", help="Also save each video's landmarks as a replayable .lmk file")
+    args = parser.parse_args()
+
+    def report(summary, done, total):
+        status = summary.get("error") or f"{summary['total_reps']} reps ({summary['realtime_factor']}x realtime)"
+        print(f"[{done}/{total}] {summary['video']}: {status}")
+
+    analyze_directory(args.video_dir, args.exercise, args.out, workers=args.workers,
+                      model_complexity=args.model_complexity, mirror=not args.no_mirror,
+                      record=args.record, progress=report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+# benchmark_trackers.py
+"""Speed and accuracy regression suite for the tracker logic (everything except pose inference).
+
+Drives each exercise's smoothing -> angles -> ExerciseEngine -> overlay path with
+synthetic landmark traces (and any labelled recordings found in
+benchmarks/traces/), then reports frames/sec, per-stage latency
+percentiles and rep-count accuracy against ground truth. Runs headless:
+no webcam, MediaPipe or Streamlit needed.
+
+    python benchmark_trackers.py                     # check counts, compare speed to this machine's baseline
+    python benchmark_trackers.py --update-baseline   # store this machine's frame rates as its baseline
+
+Every rep-count mismatch against ground truth is a regression, on any
+machine. Frame rates are machine-specific, so none are committed: the
+speed baseline is benchmarks/baseline.local.json (ignored by git), written
+by --update-baseline and only compared on the host that wrote it.
+
+Recorded traces are .lmk files (see landmark_recording.py) listed in
+benchmarks/traces/labels.json as {"file.lmk": {"exercise": "Squats", "counts": {"reps": 12}}}.
+None ship with the repository (they are recordings of people): without
+benchmarks/traces/ only the synthetic traces run. To add some, record
+landmarks with either
+
+    FORMFIT_RECORD_DIR=benchmarks/traces streamlit run gym_webapp.py   # live sessions
+    python batch_analysis.py clips/ --exercise Squats --out benchmarks/traces --record
+
+then count the reps of each recording by hand and list it in labels.json.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from exercise_engine import ExerciseEngine
+from exercises import EXERCISES
+from landmark_filter import OneEuroFilter
+from landmark_recording import LandmarkRecording
+from overlay import draw_pose, draw_rule_overlay
+from pose_angles import JOINT_ANGLES, LANDMARK_INDEX, NUM_LANDMARKS, PoseAngles
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.local.json")  # Vitesses de cette machine, non versionnées
+TRACES_DIR = os.path.join(BENCH_DIR, "traces")
+STAGES = ("smoothing", "angles", "engine", "overlay")
+FRAME_SHAPE = (480, 640, 3)
+
+# Position du sommet de chaque articulation dans l'image synthétique
+_VERTEX_POSITIONS = {
+    "left_elbow": (0.65, 0.35), "right_elbow": (0.35, 0.35),
+    "left_shoulder": (0.6, 0.25), "right_shoulder": (0.4, 0.25),
+    "left_hip": (0.6, 0.55), "right_hip": (0.4, 0.55),
+    "left_knee": (0.6, 0.75), "right_knee": (0.4, 0.75),
+}
+
+
+# --- Génération de traces synthétiques ---
+def pose_from_angles(angles: dict, out: np.ndarray = None) -> np.ndarray:
+    """Build a (33, 4) landmark array whose joint angles match `angles` (degrees)"""
+    out = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32) if out is None else out
+    out[:, 3] = 1.0
+    for joint, degrees in angles.items():
+        a, b, c = (LANDMARK_INDEX[name] for name in JOINT_ANGLES[joint])
+        bx, by = _VERTEX_POSITIONS[joint]
+        theta = math.radians(degrees)
+        out[b, :2] = (bx, by)
+        out[a, :2] = (bx, by - 0.15)
+        out[c, :2] = (bx + 0.15 * math.sin(theta), by - 0.15 * math.cos(theta))
+    return out
+
+
+def rep_wave(reps: int, top: float, bottom: float, fps: float, period: float, start: str = "top") -> np.ndarray:
+    """Angle samples for `reps` full top->bottom->top cycles (or bottom->top->bottom)"""
+    t = np.arange(int(round(reps * period * fps))) / (period * fps)
+    mid, amp = (top + bottom) / 2, (top - bottom) / 2
+    sign = 1.0 if start == "top" else -1.0
+    return mid + sign * amp * np.cos(2 * np.pi * t)
+
+
+def hold(angle: float, seconds: float, fps: float) -> np.ndarray:
+    return np.full(int(round(seconds * fps)), float(angle))
+
+
+def make_trace(name, exercise, fps, joint_series, expected, seed=0, noise=2.0):
+    """Turn per-joint angle series into a trace dict, adding Gaussian angle jitter"""
+    rng = np.random.default_rng(seed)
+    n = min(len(series) for series in joint_series.values())
+    landmarks = np.zeros((n, NUM_LANDMARKS, 4), dtype=np.float32)
+    noisy = {joint: series[:n] + rng.normal(0.0, noise, n) for joint, series in joint_series.items()}
+    for i in range(n):
+        pose_from_angles({joint: series[i] for joint, series in noisy.items()}, out=landmarks[i])
+    return {
+        "name": name,
+        "exercise": exercise,
+        "timestamps": np.arange(n) / fps,
+        "landmarks": landmarks,
+        "valid": np.ones(n, dtype=bool),
+        "expected": expected,
+    }
+
+
+def synthetic_traces(fps: float = 30.0) -> list:
+    """One labelled trace per exercise, including partial reps that must not count"""
+    squat = np.concatenate([
+        rep_wave(8, 175, 65, fps, 2.5),
+        rep_wave(2, 175, 100, fps, 2.0),  # Squats trop hauts : non comptés
+        rep_wave(2, 175, 65, fps, 2.5),
+    ])
+    deadlift = np.concatenate([rep_wave(8, 172, 95, fps, 3.0, start="bottom"), hold(95, 1.0, fps)])
+    press = np.concatenate([rep_wave(10, 172, 55, fps, 2.0), rep_wave(2, 172, 90, fps, 2.0)])
+    right_curl = rep_wave(12, 165, 35, fps, 2.0)
+    left_curl = rep_wave(10, 165, 35, fps, 2.4)
+    wall_sit = np.concatenate([
+        hold(160, 1.0, fps), hold(90, 5.0, fps),
+        hold(160, 1.0, fps), hold(90, 1.5, fps),  # Trop court : non compté
+        hold(160, 1.0, fps), hold(90, 8.0, fps), hold(160, 1.0, fps),
+    ])
+
+    return [
+        make_trace("synthetic_squats", "Squats", fps, {"left_knee": squat}, {"reps": 10}, seed=1),
+        make_trace("synthetic_deadlift", "Deadlift", fps,
+                   {"left_knee": deadlift, "left_elbow": hold(178, len(deadlift) / fps, fps)}, {"reps": 8}, seed=2),
+        make_trace("synthetic_shoulder_press", "Shoulder Press", fps, {"left_elbow": press}, {"reps": 10}, seed=3),
+        make_trace("synthetic_bicep_curls", "Bicep Curls", fps,
+                   {"right_elbow": right_curl, "left_elbow": left_curl},
+                   {"right": 12, "left": 10}, seed=4),
+        make_trace("synthetic_wall_sit", "Wall Sit", fps, {"left_knee": wall_sit}, {"sets": 2}, seed=5),
+        # Gigue du modèle léger (model_complexity=0) : ne tient que grâce au lissage
+        make_trace("jittery_squats", "Squats", fps, {"left_knee": squat}, {"reps": 10}, seed=6, noise=8.0),
+        make_trace("jittery_wall_sit", "Wall Sit", fps, {"left_knee": wall_sit}, {"sets": 2}, seed=7, noise=6.0),
+    ]
+
+
+def recorded_traces(traces_dir: str = TRACES_DIR) -> list:
+    """Load the labelled .lmk recordings listed in traces_dir/labels.json"""
+    labels_path = os.path.join(traces_dir, "labels.json")
+    if not os.path.exists(labels_path):
+        return []
+    with open(labels_path) as f:
+        labels = json.load(f)
+
+    traces = []
+    for filename, label in sorted(labels.items()):
+        recording = LandmarkRecording(os.path.join(traces_dir, filename))
+        traces.append({
+            "name": os.path.splitext(filename)[0],
+            "exercise": label["exercise"],
+            "timestamps": np.asarray(recording.timestamps, dtype=np.float64),
+            "landmarks": np.asarray(recording.landmarks, dtype=np.float32),
+            "valid": np.asarray(recording.valid, dtype=bool),
+            "expected": label["counts"],
+        })
+    return traces
+
+
+# --- Exécution du benchmark ---
+def run_trace(trace: dict, repeat: int = 3) -> dict:
+    """Replay one trace `repeat` times and time every stage of every frame"""
+    definition = EXERCISES[trace["exercise"]]
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    n = len(trace["timestamps"])
+    timings = np.zeros((len(STAGES), n * repeat))
+    perf = time.perf_counter
+
+    for r in range(repeat):
+        engine = ExerciseEngine(definition)
+        pose_angles = PoseAngles()
+        smoother = OneEuroFilter.for_exercise(definition)
+        base = r * n
+        for i in range(n):
+            timestamp = trace["timestamps"][i]
+            if not trace["valid"][i]:
+                smoother.reset()
+                continue
+            t0 = perf()
+            landmarks = smoother(trace["landmarks"][i], timestamp)
+            t1 = perf()
+            angles = pose_angles.update_array(landmarks)
+            t2 = perf()
+            engine.step(angles, timestamp)
+            t3 = perf()
+            draw_pose(frame, landmarks)
+            draw_rule_overlay(frame, engine, timestamp)
+            t4 = perf()
+            timings[:, base + i] = (t1 - t0, t2 - t1, t3 - t2, t4 - t3)
+
+    counts = {rule.name: state.count for rule, state in zip(definition.rules, engine.states)}
+    total = timings.sum(axis=0)
+    total = total[total > 0]
+    latency = {
+        stage: {f"p{q}": round(float(np.percentile(timings[s][timings[s] > 0], q) * 1e6), 1) for q in (50, 95, 99)}
+        for s, stage in enumerate(STAGES)
+    }
+    return {
+        "name": trace["name"],
+        "exercise": trace["exercise"],
+        "frames": n,
+        "fps": round(len(total) / float(total.sum()), 1),
+        "latency_us": latency,
+        "expected": trace["expected"],
+        "counts": counts,
+        "correct": counts == trace["expected"],
+    }
+
+
+def compare_to_baseline(results: list, baseline: dict, tolerance: float) -> list:
+    """Return human-readable regressions of `results`: count mismatches, and fps drops against a same-host `baseline`"""
+    regressions = []
+    # Une référence de vitesse prise sur une autre machine ne dit rien de celle-ci
+    previous = baseline.get("traces", {}) if baseline.get("host") == platform.node() else {}
+    for result in results:
+        name = result["name"]
+        if not result["correct"]:
+            regressions.append(f"{name}: counted {result['counts']}, expected {result['expected']}")
+        if name not in previous:
+            continue
+        old_fps = previous[name]["fps"]
+        if result["fps"] < old_fps * (1 - tolerance):
+            regressions.append(f"{name}: {result['fps']} fps vs baseline {old_fps} fps")
+    return regressions
+
+
+def print_report(results: list):
+    header = f"{'trace':<26} {'frames':>6} {'fps':>9}  " + "  ".join(f"{s + ' p50/p95/p99 us':>28}" for s in STAGES) + "  reps"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        stages = "  ".join(
+            f"{'/'.join(str(r['latency_us'][s][p]) for p in ('p50', 'p95', 'p99')):>28}" for s in STAGES
+        )
+        status = "ok" if r["correct"] else f"MISMATCH expected {r['expected']}"
+        print(f"{r['name']:<26} {r['frames']:>6} {r['fps']:>9}  {stages}  {r['counts']} {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the non-inference tracker path and check rep-count accuracy.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="This machine's speed baseline (JSON)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these frame rates as this machine's baseline")
+    parser.add_argument("--tolerance", type=float, default=None, help="Allowed fps drop before flagging (default: baseline's, else 0.3)")
+    parser.add_argument("--repeat", type=int, default=3, help="Replays per trace")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    traces = synthetic_traces() + recorded_traces()
+    results = [run_trace(trace, repeat=args.repeat) for trace in traces]
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    tolerance = args.tolerance if args.tolerance is not None else baseline.get("tolerance", 0.3)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"tolerance": tolerance, "host": platform.node(),
+                       "traces": {r["name"]: {"fps": r["fps"]} for r in results}}, f, indent=2)
+        print(f"\nSpeed baseline written to {args.baseline}")
+        baseline = {}  # Les erreurs de comptage restent des régressions, même en mettant la référence à jour
+
+    regressions = compare_to_baseline(results, baseline, tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\nNo regressions." if baseline.get("host") == platform.node() or args.update_baseline else
+          "\nCounts match; no speed baseline for this machine (run with --update-baseline to record one).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
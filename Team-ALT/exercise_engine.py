@@ -0,0 +1,177 @@
+# exercise_engine.py
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from pose_angles import JOINT_ANGLES
+
+# --- Couleurs de feedback (format BGR pour OpenCV) ---
+COLOR_BLUE = (255, 0, 0)
+COLOR_ORANGE = (0, 165, 255)
+COLOR_GREEN = (0, 255, 0)
+COLOR_RED = (0, 0, 255)
+COLOR_MAGENTA = (255, 0, 255)
+COLOR_CYAN = (255, 255, 0)
+
+# --- Zones d'un angle par rapport aux seuils d'hystérésis ---
+ZONE_MID = 0
+ZONE_LOW = 1
+ZONE_HIGH = 2
+
+
+@dataclass(frozen=True)
+class RepRule:
+    """Counts a rep when `joint` drops below `low` after having been above `high`.
+
+    The gap between `low` and `high` is the hysteresis band: angles inside it
+    never change the armed state, so jitter around one threshold cannot
+    double count.
+    """
+    name: str
+    joint: str
+    low: float
+    high: float
+    feedback_low: str
+    feedback_high: str
+    feedback_mid: str
+    armed: bool = True
+    label: str = "Reps"
+    session_key: str = "rep_count"
+    colors: Tuple[tuple, tuple, tuple] = (COLOR_GREEN, COLOR_GREEN, COLOR_GREEN)
+    counter_color: tuple = COLOR_BLUE
+
+
+@dataclass(frozen=True)
+class HoldRule:
+    """Counts a set each time `joint` stays within [low, high] for more than `min_hold` seconds."""
+    name: str
+    joint: str
+    low: float
+    high: float
+    feedback_in: str
+    feedback_out: str
+    min_hold: float = 2.0
+    label: str = "Sets"
+    session_key: str = "rep_count"
+    colors: Tuple[tuple, tuple] = (COLOR_GREEN, COLOR_ORANGE)
+    counter_color: tuple = COLOR_CYAN
+    timer_color: tuple = COLOR_MAGENTA
+
+
+@dataclass(frozen=True)
+class FormCheck:
+    """Freezes every rule and shows `feedback` while `joint` is below `below` (or above `above`)."""
+    joint: str
+    feedback: str
+    below: Optional[float] = None
+    above: Optional[float] = None
+    color: tuple = COLOR_GREEN
+
+
+@dataclass(frozen=True)
+class ExerciseDefinition:
+    name: str
+    rules: tuple
+    checks: tuple = ()
+    no_pose_feedback: Optional[str] = None
+    max_skip: int = 1  # Images consécutives sans inférence autorisées (landmarks extrapolés)
+    # Lissage One-Euro des landmarks : coupure au repos (Hz) et réactivité à la vitesse
+    smoothing_min_cutoff: float = 1.0
+    smoothing_beta: float = 5.0
+
+
+@dataclass
+class RuleState:
+    count: int = 0
+    armed: bool = True
+    zone: int = ZONE_MID
+    feedback: str = ""
+    color: tuple = COLOR_GREEN
+    holding: bool = False
+    hold_start: float = 0.0
+    hold_total: float = 0.0
+    hold_durations: list = field(default_factory=list)
+
+
+class ExerciseEngine:
+    """Rule-driven rep/hold state machine shared by every exercise.
+
+    Rules are compiled once into flat tuples of angle indices and
+    thresholds, so `step()` costs a fixed number of comparisons per frame
+    whatever the exercise.
+    """
+
+    def __init__(self, definition: ExerciseDefinition, angle_index: dict = None):
+        self.definition = definition
+        index = angle_index or {name: i for i, name in enumerate(JOINT_ANGLES)}
+
+        self._checks = tuple(
+            (index[check.joint], check.below, check.above, check.feedback, check.color)
+            for check in definition.checks
+        )
+        self._program = tuple(
+            (isinstance(rule, HoldRule), index[rule.joint], rule.low, rule.high, rule)
+            for rule in definition.rules
+        )
+        self.states = [RuleState(armed=getattr(rule, "armed", True)) for rule in definition.rules]
+        self._by_name = {rule.name: state for rule, state in zip(definition.rules, self.states)}
+
+    def step(self, angles, timestamp: float) -> list:
+        """Advance every rule with this frame's angles; return the names of rules that just completed"""
+        blocked = None
+        for joint, below, above, feedback, color in self._checks:
+            angle = angles[joint]
+            if (below is not None and angle < below) or (above is not None and angle > above):
+                blocked = (feedback, color)
+                break
+
+        completed = []
+        for (is_hold, joint, low, high, rule), state in zip(self._program, self.states):
+            if blocked is not None:
+                state.feedback, state.color = blocked
+                continue
+
+            angle = angles[joint]
+            if is_hold:
+                if low <= angle <= high:
+                    state.feedback, state.color = rule.feedback_in, rule.colors[0]
+                    if not state.holding:
+                        state.holding = True
+                        state.hold_start = timestamp
+                else:
+                    state.feedback, state.color = rule.feedback_out, rule.colors[1]
+                    if state.holding:
+                        state.holding = False
+                        duration = timestamp - state.hold_start
+                        if duration > rule.min_hold:
+                            state.hold_durations.append(int(duration))
+                            state.hold_total += duration
+                            state.count = len(state.hold_durations)
+                            completed.append(rule.name)
+            elif angle < low:
+                state.zone = ZONE_LOW
+                state.feedback, state.color = rule.feedback_low, rule.colors[0]
+                if state.armed:
+                    state.count += 1
+                    state.armed = False
+                    completed.append(rule.name)
+            elif angle > high:
+                state.zone = ZONE_HIGH
+                state.feedback, state.color = rule.feedback_high, rule.colors[1]
+                state.armed = True
+            else:
+                state.zone = ZONE_MID
+                state.feedback, state.color = rule.feedback_mid, rule.colors[2]
+        return completed
+
+    def count(self, name: str) -> int:
+        return self._by_name[name].count
+
+    def hold_time(self, name: str, timestamp: float) -> float:
+        """Total held time for a hold rule, including the hold in progress"""
+        state = self._by_name[name]
+        elapsed = (timestamp - state.hold_start) if state.holding else 0
+        return state.hold_total + elapsed
+
+    @property
+    def total_count(self) -> int:
+        return sum(state.count for state in self.states)
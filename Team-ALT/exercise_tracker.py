@@ -0,0 +1,164 @@
+# exercise_tracker.py
+import contextlib
+import os
+import time
+import uuid
+from datetime import datetime
+
+import cv2
+import streamlit as st
+
+from pose_utils import get_pose_pool
+from pose_pool import PoolTimeout
+from pose_angles import PoseAngles
+from frame_pipeline import FramePipeline
+from adaptive_inference import AdaptiveInference, AdaptiveScheduler
+from quality_control import AdaptiveQualityEstimator, LatencyController, QUALITY_LEVELS, DEFAULT_LEVEL
+from roi_tracking import RoiTracker
+from exercise_engine import ExerciseEngine, COLOR_RED
+from overlay import draw_pose, draw_rule_overlay, draw_text
+from landmark_recording import LandmarkRecorder
+from landmark_filter import OneEuroFilter
+from video_stream import get_stream_server
+
+# Dossier d'enregistrement des landmarks (désactivé si non défini)
+RECORD_DIR = os.environ.get("FORMFIT_RECORD_DIR")
+
+# Cadence d'inférence visée ; FORMFIT_AUTO_QUALITY=0 fige model_complexity et la résolution d'entrée
+TARGET_FPS = float(os.environ.get("FORMFIT_TARGET_FPS", "20"))
+AUTO_QUALITY = os.environ.get("FORMFIT_AUTO_QUALITY", "1") != "0"
+# Inférence recadrée autour de la pose précédente (FORMFIT_ROI=0 pour toujours traiter l'image entière)
+ROI_TRACKING = os.environ.get("FORMFIT_ROI", "1") != "0"
+# Transport des images vers le navigateur : "streamlit" (stframe.image) ou "mjpeg" (flux HTTP dédié).
+# Le flux MJPEG est servi hors de Streamlit (FORMFIT_STREAM_HOST/URL) : il n'est activé que sur demande.
+FRAME_TRANSPORT = os.environ.get("FORMFIT_TRANSPORT", "streamlit")
+
+
+def get_engine(definition):
+    """Return this session's engine for `definition`, creating it (seeded from session counters) if needed"""
+    engine = st.session_state.get('exercise_engine')
+    if engine is None or engine.definition.name != definition.name:
+        engine = ExerciseEngine(definition)
+        for rule, state in zip(definition.rules, engine.states):
+            state.count = st.session_state.get(rule.session_key, 0)
+        st.session_state.exercise_engine = engine
+    return engine
+
+
+def sync_session_counts(engine):
+    """Mirror the engine counters into st.session_state for the rest of the app"""
+    for rule, state in zip(engine.definition.rules, engine.states):
+        st.session_state[rule.session_key] = state.count
+
+
+def make_quality_controller():
+    """Latency controller for this session, resuming from the level its previous run settled on"""
+    if not AUTO_QUALITY:
+        return LatencyController(TARGET_FPS, levels=(QUALITY_LEVELS[DEFAULT_LEVEL],), start_level=0)
+    level = st.session_state.get('quality_level', DEFAULT_LEVEL)
+    return LatencyController(TARGET_FPS, start_level=level)
+
+
+def open_session_recorder(definition):
+    """Return a LandmarkRecorder for this session when FORMFIT_RECORD_DIR is set, else a no-op context"""
+    if not RECORD_DIR:
+        return contextlib.nullcontext()
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    name = definition.name.lower().replace(" ", "_")
+    return LandmarkRecorder(os.path.join(RECORD_DIR, f"{name}_{datetime.now():%Y%m%d_%H%M%S}.lmk"))
+
+
+def open_frame_output(stack, stframe):
+    """Return show(frame) for this run: the session's MJPEG channel when enabled, else stframe.image"""
+    if FRAME_TRANSPORT == "mjpeg":
+        try:
+            server = get_stream_server()
+        except OSError as e:
+            st.warning(f"⚠️ Video stream unavailable ({str(e)}), falling back to Streamlit images.")
+        else:
+            stream_id = st.session_state.setdefault('stream_id', uuid.uuid4().hex)
+            channel = stack.enter_context(server.open_channel(stream_id))
+            stframe.markdown(server.img_tag(stream_id), unsafe_allow_html=True)
+            return channel.publish
+    return lambda frame: stframe.image(frame, channels="BGR", use_container_width=True)
+
+
+def run_exercise_tracker(definition, stframe=None, cap=None, keep_running=None, overlay=None,
+                         frame_delay: float = 0.0, capture_error: str = "Failed to capture webcam."):
+    """Run the shared capture/inference/render loop for one exercise.
+
+    This is the only per-frame loop in the app: pose inference runs in the
+    pipeline threads on a Pose instance checked out from the shared pools
+    (skipped on near-static frames, up to the exercise's `max_skip`, with
+    model_complexity and input resolution tuned to hold TARGET_FPS, and
+    cropped to the region around the previous pose), and each rendered
+    frame costs one One-Euro landmark update, one vectorized angle pass and
+    one `ExerciseEngine.step()`. Frames reach the browser through
+    stframe.image, or with FORMFIT_TRANSPORT=mjpeg through the MJPEG stream
+    (encoded on demand, at the rate the viewer consumes them).
+    `overlay(frame, engine, angles)` lets a page draw extra information on
+    top of the rule overlay.
+    """
+    stframe = stframe if stframe is not None else st.empty()
+    cap = cap if cap is not None else cv2.VideoCapture(0)
+    keep_running = keep_running or (lambda: st.session_state.view == 'session')
+
+    engine = get_engine(definition)
+    pose_angles = PoseAngles()
+    smoother = OneEuroFilter.for_exercise(definition)
+
+    with contextlib.ExitStack() as stack:
+        # Instance Pose réservée à cette session pendant toute la durée du tracker
+        controller = make_quality_controller()
+        try:
+            estimator = stack.enter_context(AdaptiveQualityEstimator(
+                get_pose_pool, controller, roi=RoiTracker() if ROI_TRACKING else None))
+        except PoolTimeout as e:
+            st.error(f"❌ {str(e)}. Please try again in a moment.")
+            cap.release()
+            return engine
+
+        # L'enregistreur est ouvert avant le pipeline et fermé après : il reçoit chaque inférence réelle
+        recorder = stack.enter_context(open_session_recorder(definition))
+        inference = AdaptiveInference(estimator, AdaptiveScheduler(max_skip=definition.max_skip), recorder=recorder)
+        pipeline = stack.enter_context(FramePipeline(cap, inference))
+        show = open_frame_output(stack, stframe)
+
+        for frame, landmarks, timestamp in pipeline.frames():
+            if not keep_running():
+                break
+
+            # Lissage temporel avant dessin et angles (l'enregistrement garde les landmarks bruts)
+            landmarks = smoother(landmarks, timestamp)
+            angles = None
+            if landmarks is not None:
+                draw_pose(frame, landmarks)
+                angles = pose_angles.update_array(landmarks)
+                if engine.step(angles, timestamp):
+                    sync_session_counts(engine)
+                draw_rule_overlay(frame, engine, timestamp)
+            elif definition.no_pose_feedback:
+                draw_text(frame, definition.no_pose_feedback, (50, 50), 0.7, COLOR_RED, 2)
+
+            if overlay is not None:
+                overlay(frame, engine, pose_angles if angles is not None else None)
+
+            show(frame)
+            pipeline.release(frame)
+
+            if frame_delay:
+                time.sleep(frame_delay)
+
+    if AUTO_QUALITY:
+        st.session_state.quality_level = controller.level
+    # Compteurs d'allocation de la dernière session (tampons d'image et d'inférence)
+    st.session_state.pipeline_metrics = {**pipeline.metrics(), "inference_allocations": estimator.allocations}
+
+    if pipeline.capture_failed:
+        st.error(capture_error)
+    elif pipeline.error is not None:
+        st.error(f"❌ Error processing pose: {str(pipeline.error)}")
+
+    cap.release()
+    cv2.destroyAllWindows()
+    return engine
@@ -0,0 +1,93 @@
+# exercises.py
+from exercise_engine import (
+    ExerciseDefinition, RepRule, HoldRule, FormCheck,
+    COLOR_BLUE, COLOR_ORANGE, COLOR_GREEN, COLOR_MAGENTA, COLOR_CYAN,
+)
+
+# --- Définitions déclaratives des exercices ---
+# Ajouter un exercice = ajouter une entrée ici, sans nouvelle boucle de capture.
+
+SQUATS = ExerciseDefinition(
+    name="Squats",
+    rules=(
+        RepRule(
+            name="reps", joint="left_knee", low=80, high=170,
+            feedback_low="Good squat!",
+            feedback_high="Stand up straight!",
+            feedback_mid="Go lower!",
+        ),
+    ),
+)
+
+DEADLIFT = ExerciseDefinition(
+    name="Deadlift",
+    rules=(
+        RepRule(
+            name="reps", joint="left_knee", low=110, high=160,
+            feedback_low="Good rep! Lift again.",
+            feedback_high="Good lockout! Lower now.",
+            feedback_mid="Lower the bar and maintain form!",
+            armed=False,  # Il faut d'abord verrouiller en haut
+        ),
+    ),
+    checks=(
+        FormCheck(joint="left_elbow", below=170, feedback="Keep your arms straight!"),
+    ),
+    max_skip=2,
+)
+
+SHOULDER_PRESS = ExerciseDefinition(
+    name="Shoulder Press",
+    rules=(
+        RepRule(
+            name="reps", joint="left_elbow", low=70, high=160,
+            feedback_low="Go Up!",
+            feedback_high="Arms Up!",
+            feedback_mid="Now Down!",
+        ),
+    ),
+)
+
+WALL_SIT = ExerciseDefinition(
+    name="Wall Sit",
+    rules=(
+        HoldRule(
+            name="sets", joint="left_knee", low=80, high=100, min_hold=2.0,
+            feedback_in="Perfect form! Hold it.",
+            feedback_out="Get into the wall sit position!",
+        ),
+    ),
+    max_skip=3,
+    smoothing_min_cutoff=0.5,  # Position statique : lissage fort
+    smoothing_beta=2.0,
+)
+
+BICEP_CURLS = ExerciseDefinition(
+    name="Bicep Curls",
+    rules=(
+        RepRule(
+            name="right", joint="right_elbow", low=50, high=150,
+            feedback_low="Good Right Curl!",
+            feedback_high="Right Arm Extended",
+            feedback_mid="Curl More!",
+            label="Right Curls", session_key="right_rep_count",
+            colors=(COLOR_GREEN, COLOR_BLUE, COLOR_ORANGE), counter_color=COLOR_MAGENTA,
+        ),
+        RepRule(
+            name="left", joint="left_elbow", low=50, high=150,
+            feedback_low="Good Left Curl!",
+            feedback_high="Left Arm Extended",
+            feedback_mid="Curl More!",
+            label="Left Curls", session_key="left_rep_count",
+            colors=(COLOR_GREEN, COLOR_BLUE, COLOR_ORANGE), counter_color=COLOR_CYAN,
+        ),
+    ),
+    no_pose_feedback="No pose detected - Position yourself in view",
+    smoothing_min_cutoff=1.5,  # Mouvements de bras rapides : moins de retard
+    smoothing_beta=10.0,
+)
+
+EXERCISES = {
+    definition.name: definition
+    for definition in (BICEP_CURLS, SHOULDER_PRESS, SQUATS, WALL_SIT, DEADLIFT)
+}
@@ -0,0 +1,75 @@
+# frame_buffers.py
+import threading
+
+import numpy as np
+
+
+class FrameBufferPool:
+    """Recycles full-size frame arrays between the capture, inference and render stages.
+
+    The capture stage decodes straight into an acquired buffer and the
+    render stage releases it once the frame has been shown (queues release
+    the frames they drop), so a steady-state session allocates no new
+    frames. Buffers of another shape are discarded, e.g. after the camera
+    resolution changes.
+    """
+
+    def __init__(self, max_free: int = 4):
+        self.max_free = max_free
+        self._free = []
+        self._lock = threading.Lock()
+
+        # Compteurs d'allocation
+        self.allocated = 0
+        self.reused = 0
+        self.released = 0
+
+    def acquire(self, shape: tuple, dtype=np.uint8) -> np.ndarray:
+        """Return a buffer of `shape`, reusing a released one when possible"""
+        with self._lock:
+            while self._free:
+                buffer = self._free.pop()
+                if buffer.shape == shape and buffer.dtype == dtype:
+                    self.reused += 1
+                    return buffer
+            self.allocated += 1
+        return np.empty(shape, dtype=dtype)
+
+    def adopt(self, buffer: np.ndarray) -> np.ndarray:
+        """Count a buffer allocated outside the pool (e.g. by OpenCV) that will be released into it"""
+        with self._lock:
+            self.allocated += 1
+        return buffer
+
+    def release(self, buffer: np.ndarray):
+        """Give a buffer back; it must not be used by the caller afterwards"""
+        with self._lock:
+            self.released += 1
+            if len(self._free) < self.max_free:
+                self._free.append(buffer)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            acquired = self.allocated + self.reused
+            return {
+                "allocated": self.allocated,
+                "reused": self.reused,
+                "released": self.released,
+                "free": len(self._free),
+                "allocations_per_frame": self.allocated / acquired if acquired else 0.0,
+            }
+
+
+class ScratchBuffer:
+    """Single-owner output array for OpenCV `dst=` calls, counting the times OpenCV had to reallocate it."""
+
+    def __init__(self):
+        self.array = None
+        self.allocations = 0
+
+    def keep(self, result: np.ndarray) -> np.ndarray:
+        """Store the array an OpenCV call returned for `dst=self.array`, and return it"""
+        if result is not self.array:
+            self.allocations += 1
+            self.array = result
+        return result
@@ -0,0 +1,151 @@
+# frame_pipeline.py
+import collections
+import queue
+import threading
+import time
+
+import cv2
+
+from frame_buffers import FrameBufferPool
+
+
+class LatestQueue:
+    """Bounded queue that drops the oldest item when full, so readers always get the freshest one.
+
+    `on_drop(item)` is called for every discarded item, e.g. to recycle its frame buffer.
+    """
+
+    def __init__(self, maxsize: int = 1, on_drop=None):
+        self._items = collections.deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.on_drop = on_drop
+        self.dropped = 0
+
+    def put(self, item):
+        """Append an item, discarding the oldest one if the queue is full"""
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+                if self.on_drop is not None:
+                    self.on_drop(self._items[0])
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout: float = None):
+        """Pop the oldest queued item, raising queue.Empty after `timeout` seconds"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            return self._items.popleft()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class FramePipeline:
+    """Capture -> inference -> render pipeline.
+
+    Capture and inference each run in their own thread and are connected by
+    drop-oldest queues; the render stage is the caller iterating over
+    `frames()`, which stays on the Streamlit script thread. Every frame
+    carries its monotonic capture timestamp, and `process(frame, timestamp)`
+    returns the frame's (33, 4) landmark array or None.
+
+    Frames are decoded into buffers from `buffers` and flipped in place; the
+    render stage hands each one back with `release(frame)` once shown.
+    """
+
+    def __init__(self, cap, process, queue_size: int = 1, flip: bool = True, buffers: FrameBufferPool = None):
+        self.cap = cap
+        self.process = process
+        self.flip = flip
+        self.buffers = buffers if buffers is not None else FrameBufferPool(max_free=2 * queue_size + 2)
+        self.capture_failed = False
+        self.error = None
+        self.captured = 0
+
+        recycle = lambda item: self.buffers.release(item[0])
+        self._frames = LatestQueue(queue_size, on_drop=recycle)
+        self._results = LatestQueue(queue_size, on_drop=recycle)
+        self._stop = threading.Event()
+        self._threads = []
+
+    # --- Étapes en arrière-plan ---
+    def _capture_loop(self):
+        shape = None
+        while not self._stop.is_set():
+            buffer = self.buffers.acquire(shape) if shape is not None else None
+            ret, frame = self.cap.read(buffer)
+            timestamp = time.monotonic()
+            if not ret:
+                self.capture_failed = True
+                self._stop.set()
+                break
+            if frame is not buffer:
+                # Première image ou changement de résolution : OpenCV a alloué un nouveau tampon
+                shape = self.buffers.adopt(frame).shape
+            if self.flip:
+                cv2.flip(frame, 1, dst=frame)
+            self.captured += 1
+            self._frames.put((frame, timestamp))
+
+    def _inference_loop(self):
+        while not self._stop.is_set():
+            try:
+                frame, timestamp = self._frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                landmarks = self.process(frame, timestamp)
+            except Exception as e:
+                self.error = e
+                self._stop.set()
+                break
+            self._results.put((frame, landmarks, timestamp))
+
+    # --- Contrôle du pipeline ---
+    def start(self):
+        """Start the capture and inference threads"""
+        for target in (self._capture_loop, self._inference_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """Signal both stages to stop and wait for them to exit"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return not self._stop.is_set()
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._frames.dropped + self._results.dropped
+
+    def release(self, frame):
+        """Recycle a frame yielded by `frames()` once the render stage is done with it"""
+        self.buffers.release(frame)
+
+    def metrics(self) -> dict:
+        """Capture, drop and frame-buffer allocation counters"""
+        return {"captured": self.captured, "dropped": self.dropped_frames, **self.buffers.metrics()}
+
+    def frames(self, poll_interval: float = 0.1):
+        """Yield (frame, landmarks, timestamp) for the render stage until the pipeline stops"""
+        while self.running or len(self._results):
+            try:
+                yield self._results.get(timeout=poll_interval)
+            except queue.Empty:
+                continue
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
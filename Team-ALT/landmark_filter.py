@@ -0,0 +1,75 @@
+# landmark_filter.py
+import math
+
+import numpy as np
+
+from pose_angles import NUM_LANDMARKS
+
+
+class OneEuroFilter:
+    """One-Euro filter over all landmarks at once (x, y, z; visibility passes through).
+
+    Each coordinate is low-pass filtered with a cutoff that rises with its
+    own speed: `min_cutoff` (Hz) sets how much jitter is removed when the
+    body is still, `beta` how quickly the filter lets fast movements through
+    without lag. One update is a handful of NumPy operations on a (33, 3)
+    state, whatever the number of landmarks.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 5.0, d_cutoff: float = 1.0,
+                 n_landmarks: int = NUM_LANDMARKS):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+        self._value = np.zeros((n_landmarks, 3), dtype=np.float32)
+        self._speed = np.zeros((n_landmarks, 3), dtype=np.float32)
+        self._delta = np.empty((n_landmarks, 3), dtype=np.float32)
+        self._alpha = np.empty((n_landmarks, 3), dtype=np.float32)
+        self._out = np.zeros((n_landmarks, 4), dtype=np.float32)
+        self._last_time = None
+
+    @classmethod
+    def for_exercise(cls, definition):
+        """Filter tuned with the exercise's smoothing settings"""
+        return cls(min_cutoff=definition.smoothing_min_cutoff, beta=definition.smoothing_beta)
+
+    def reset(self):
+        """Forget the filter state, e.g. when the pose is lost"""
+        self._last_time = None
+
+    def __call__(self, landmarks, timestamp: float):
+        """Filter one (33, 4) landmark array; returns a buffer reused on the next call (None stays None)"""
+        if landmarks is None:
+            self.reset()
+            return None
+
+        out = self._out
+        out[:, 3] = landmarks[:, 3]
+        if self._last_time is None or timestamp <= self._last_time:
+            if self._last_time is None:
+                self._value[:] = landmarks[:, :3]
+                self._speed[:] = 0.0
+                self._last_time = timestamp
+            out[:, :3] = self._value
+            return out
+
+        dt = timestamp - self._last_time
+        self._last_time = timestamp
+
+        # Vitesse lissée, puis fréquence de coupure adaptée à cette vitesse
+        np.subtract(landmarks[:, :3], self._value, out=self._delta)
+        speed_alpha = 1.0 / (1.0 + 1.0 / (2 * math.pi * self.d_cutoff * dt))
+        self._speed += speed_alpha * (self._delta / dt - self._speed)
+
+        np.abs(self._speed, out=self._alpha)
+        self._alpha *= self.beta
+        self._alpha += self.min_cutoff
+        # alpha = 1 / (1 + tau / dt) avec tau = 1 / (2 pi cutoff)
+        self._alpha *= 2 * math.pi * dt
+        self._alpha /= 1.0 + self._alpha
+
+        self._delta *= self._alpha
+        self._value += self._delta
+        out[:, :3] = self._value
+        return out
@@ -0,0 +1,183 @@
+# landmark_recording.py
+"""Compact columnar recording of pose landmarks, and replay without camera or model.
+
+File layout (.lmk, little endian), each column padded to 8 bytes:
+
+    header      32 bytes  magic, version, landmarks, channels, frame count, start time (Unix epoch)
+    timestamps  float32[N]          seconds since the first frame
+    valid       uint8[N]            1 if a pose was detected on the frame
+    landmarks   float16[N, 33, 4]   x, y, z, visibility
+
+A frame costs 269 bytes, so a 1000-frame set is ~270 KB, and every column
+can be memory-mapped directly with numpy.
+
+    python landmark_recording.py session.lmk --exercise Squats
+"""
+import argparse
+import struct
+import time
+
+import numpy as np
+
+from exercise_engine import ExerciseEngine
+from landmark_filter import OneEuroFilter
+from exercises import EXERCISES
+from pose_angles import NUM_LANDMARKS, PoseAngles
+
+MAGIC = b"FFLM"
+VERSION = 1
+CHANNELS = 4
+HEADER = struct.Struct("<4sHHHxxQd")
+HEADER_SIZE = 32
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _column_offsets(n_frames: int, n_landmarks: int, channels: int):
+    timestamps = HEADER_SIZE
+    valid = _aligned(timestamps + 4 * n_frames)
+    landmarks = _aligned(valid + n_frames)
+    end = landmarks + 2 * n_frames * n_landmarks * channels
+    return timestamps, valid, landmarks, end
+
+
+class LandmarkRecorder:
+    """Appends per-frame landmarks to growable columns and writes the .lmk file on close.
+
+    Frame timestamps may come from any clock (monotonic capture time, video
+    time); they are stored as offsets from the first one. `start_time` is
+    the wall-clock time of that first frame, taken separately.
+    """
+
+    def __init__(self, path: str, capacity: int = 1024):
+        self.path = path
+        self.start_time = None  # Heure murale (time.time()) de la première image
+        self._first_timestamp = None  # Horloge des images, origine des décalages
+        self._count = 0
+        self._timestamps = np.zeros(capacity, dtype=np.float32)
+        self._valid = np.zeros(capacity, dtype=np.uint8)
+        self._landmarks = np.zeros((capacity, NUM_LANDMARKS, CHANNELS), dtype=np.float16)
+
+    def _grow(self):
+        capacity = 2 * len(self._timestamps)
+        self._timestamps = np.resize(self._timestamps, capacity)
+        self._valid = np.resize(self._valid, capacity)
+        self._landmarks = np.resize(self._landmarks, (capacity, NUM_LANDMARKS, CHANNELS))
+
+    def append(self, timestamp: float, landmarks: np.ndarray = None):
+        """Record one frame; pass landmarks=None when no pose was detected"""
+        if self._count == len(self._timestamps):
+            self._grow()
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+            self.start_time = time.time()
+
+        i = self._count
+        self._timestamps[i] = timestamp - self._first_timestamp
+        if landmarks is None:
+            self._valid[i] = 0
+            self._landmarks[i] = 0
+        else:
+            self._valid[i] = 1
+            self._landmarks[i] = landmarks
+        self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        """Write all recorded frames to `path`"""
+        n = self._count
+        timestamps, valid, landmarks, end = _column_offsets(n, NUM_LANDMARKS, CHANNELS)
+        with open(self.path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, NUM_LANDMARKS, CHANNELS, n, self.start_time or time.time()).ljust(HEADER_SIZE, b"\0"))
+            f.seek(timestamps)
+            f.write(self._timestamps[:n].astype("<f4").tobytes())
+            f.seek(valid)
+            f.write(self._valid[:n].tobytes())
+            f.seek(landmarks)
+            f.write(self._landmarks[:n].astype("<f2").tobytes())
+            f.truncate(end)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class LandmarkRecording:
+    """Read-only, memory-mapped view of a .lmk file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version, n_landmarks, channels, n_frames, start_time = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a landmark recording")
+        if version != VERSION:
+            raise ValueError(f"Unsupported landmark recording version {version}")
+
+        self.start_time = start_time
+        timestamps, valid, landmarks, _ = _column_offsets(n_frames, n_landmarks, channels)
+        if n_frames:
+            self.timestamps = np.memmap(path, dtype="<f4", mode="r", offset=timestamps, shape=(n_frames,))
+            self.valid = np.memmap(path, dtype=np.uint8, mode="r", offset=valid, shape=(n_frames,))
+            self.landmarks = np.memmap(path, dtype="<f2", mode="r", offset=landmarks, shape=(n_frames, n_landmarks, channels))
+        else:
+            self.timestamps = np.zeros(0, dtype=np.float32)
+            self.valid = np.zeros(0, dtype=np.uint8)
+            self.landmarks = np.zeros((0, n_landmarks, channels), dtype=np.float16)
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def frames(self):
+        """Yield (timestamp, landmarks or None) for every recorded frame"""
+        for timestamp, valid, landmarks in zip(self.timestamps, self.valid, self.landmarks):
+            yield float(timestamp), (landmarks if valid else None)
+
+
+def replay(path: str, definition, on_frame=None) -> ExerciseEngine:
+    """Run an exercise's rules over a recording, with no camera or pose model.
+
+    `on_frame(timestamp, engine, pose_angles)` is called after each frame
+    with a detected pose, e.g. to collect angle traces. Landmarks go
+    through the same smoothing as in the live tracker.
+    """
+    recording = LandmarkRecording(path)
+    engine = ExerciseEngine(definition)
+    pose_angles = PoseAngles()
+    smoother = OneEuroFilter.for_exercise(definition)
+    for timestamp, landmarks in recording.frames():
+        landmarks = smoother(landmarks, timestamp)
+        if landmarks is None:
+            continue
+        engine.step(pose_angles.update_array(landmarks), timestamp)
+        if on_frame is not None:
+            on_frame(timestamp, engine, pose_angles)
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a landmark recording through an exercise's rep counter.")
+    parser.add_argument("recording", help="Path to a .lmk file")
+    parser.add_argument("--exercise", required=True, choices=list(EXERCISES))
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    engine = replay(args.recording, EXERCISES[args.exercise])
+    elapsed = time.perf_counter() - started
+
+    recording = LandmarkRecording(args.recording)
+    duration = float(recording.timestamps[-1]) if len(recording) else 0.0
+    print(f"{len(recording)} frames, {duration:.1f}s of session replayed in {elapsed * 1000:.1f} ms")
+    for rule, state in zip(engine.definition.rules, engine.states):
+        print(f"{rule.label}: {state.count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# overlay.py
+import collections
+import threading
+
+import cv2
+import numpy as np
+
+from exercise_engine import HoldRule
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+# Connexions du squelette MediaPipe Pose (identiques à mp_pose.POSE_CONNECTIONS)
+POSE_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+    (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+)
+VISIBILITY_THRESHOLD = 0.5
+LANDMARK_COLOR = (0, 0, 255)
+CONNECTION_COLOR = (224, 224, 224)
+
+
+_CONNECTIONS = np.array(POSE_CONNECTIONS, dtype=np.intp)
+TEXT_CACHE_SIZE = 256
+
+
+class TextCache:
+    """Pre-rasterized text patches, shared by every session of the process.
+
+    A patch is the text's coverage mask rasterized once by `cv2.putText`,
+    stored as an inverse alpha layer plus the premultiplied text colour, so
+    drawing a cached string is a two-call alpha blend over a small region
+    (same pixels as putText) instead of a glyph rasterization. Strings that
+    change (counters, timers) are rasterized once per distinct value; least
+    recently used patches are evicted past `max_size`.
+    """
+
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._patches = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str, scale: float, color: tuple, thickness: int):
+        """Return (inverse alpha, premultiplied colour, offset from the text origin)"""
+        key = (text, scale, color, thickness)
+        with self._lock:
+            patch = self._patches.get(key)
+            if patch is not None:
+                self._patches.move_to_end(key)
+                self.hits += 1
+                return patch
+        patch = self._rasterize(text, scale, color, thickness)
+        with self._lock:
+            self.misses += 1
+            self._patches[key] = patch
+            if len(self._patches) > self.max_size:
+                self._patches.popitem(last=False)
+        return patch
+
+    @staticmethod
+    def _rasterize(text, scale, color, thickness):
+        (width, height), baseline = cv2.getTextSize(text, FONT, scale, thickness)
+        pad = thickness + 1
+        mask = np.zeros((height + baseline + 2 * pad, width + 2 * pad), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, height + pad), FONT, scale, 255, thickness)
+        inverse = cv2.merge([255 - mask] * 3)
+        premultiplied = (mask[..., None] * (np.array(color, dtype=np.float32) / 255.0) + 0.5).astype(np.uint8)
+        return inverse, premultiplied, (-pad, -height - pad)
+
+
+TEXT_CACHE = TextCache()
+
+
+def draw_text(frame, text: str, org: tuple, scale: float = 1.0, color: tuple = (255, 255, 255), thickness: int = 2):
+    """Drop-in for cv2.putText(frame, text, org, FONT, scale, color, thickness) using cached patches"""
+    inverse, premultiplied, (dx, dy) = TEXT_CACHE.get(text, scale, color, thickness)
+    x0, y0 = org[0] + dx, org[1] + dy
+    height, width = inverse.shape[:2]
+    fx0, fy0 = max(x0, 0), max(y0, 0)
+    fx1, fy1 = min(x0 + width, frame.shape[1]), min(y0 + height, frame.shape[0])
+    if fx0 >= fx1 or fy0 >= fy1:
+        return
+    px, py = fx0 - x0, fy0 - y0
+    rows, cols = slice(py, py + fy1 - fy0), slice(px, px + fx1 - fx0)
+    roi = frame[fy0:fy1, fx0:fx1]
+    cv2.multiply(roi, inverse[rows, cols], dst=roi, scale=1 / 255)
+    cv2.add(roi, premultiplied[rows, cols], dst=roi)
+
+
+def draw_pose(frame, landmarks):
+    """Draw the skeleton of a (33, 4) landmark array in two batched passes, skipping landmarks that are not visible"""
+    height, width = frame.shape[:2]
+    points = (landmarks[:, :2] * (width, height)).astype(np.int32)
+    visible = landmarks[:, 3] >= VISIBILITY_THRESHOLD
+    segments = points[_CONNECTIONS[visible[_CONNECTIONS].all(axis=1)]]
+    if len(segments):
+        cv2.polylines(frame, segments, False, CONNECTION_COLOR, 2)
+    # Un point répété avec un trait épais donne un disque : tous les landmarks en un appel
+    dots = np.repeat(points[visible][:, None, :], 2, axis=1)
+    if len(dots):
+        cv2.polylines(frame, dots, False, LANDMARK_COLOR, 6)
+
+
+def draw_rule_overlay(frame, engine, timestamp):
+    """Draw each rule's feedback and counter, stacked from the top-left corner"""
+    y = 50
+    for rule, state in zip(engine.definition.rules, engine.states):
+        draw_text(frame, state.feedback, (50, y), 1, state.color, 2)
+        if isinstance(rule, HoldRule):
+            draw_text(frame, f"Total Time: {int(engine.hold_time(rule.name, timestamp))}s", (50, y + 50), 1, rule.timer_color, 2)
+            draw_text(frame, f"{rule.label}: {state.count}", (50, y + 100), 1, rule.counter_color, 2)
+            y += 150
+        else:
+            draw_text(frame, f"{rule.label}: {state.count}", (50, y + 50), 1, rule.counter_color, 2)
+            y += 100
@@ -44,6 +44,7 @@ if st.session_state.view == 'selection':
             st.session_state.messages = [{"role": "assistant", "content": f"Hello! Ready for {selected_exercise}? Ask me your questions."}]
             st.session_state.rep_count = 0
             st.session_state.previous_feedback = ""
+            st.session_state.pop('exercise_engine', None)
             if selected_exercise == "Bicep Curls":
                 st.session_state.left_rep_count = 0
                 st.session_state.right_rep_count = 0
@@ -98,7 +99,7 @@ elif st.session_state.view == 'rest':
     st.info(f"Rest for **{rest_time} seconds**.")
     if st.button("Do another exercise", use_container_width=True):
         st.session_state.view = 'selection'
-        keys_to_pop = ['selected_exercise', 'rep_count', 'left_rep_count', 'right_rep_count', 'previous_feedback']
+        keys_to_pop = ['selected_exercise', 'rep_count', 'left_rep_count', 'right_rep_count', 'previous_feedback', 'exercise_engine']
         for key in keys_to_pop:
             st.session_state.pop(key, None)
         st.rerun()
\ No newline at end of file
@@ -1,7 +1,9 @@
 # bicep_curls_detection.py
 import cv2
 import streamlit as st
-from pose_utils import pose, mp_drawing, mp_pose, calculate_angle
+from exercise_tracker import run_exercise_tracker
+from overlay import draw_text
+from exercises import BICEP_CURLS
 from database.models import DatabaseManager, WorkoutTracker
 from auth.authenticator import get_authenticator
 from datetime import datetime
@@ -89,6 +91,7 @@ def reset_session_counters():
     st.session_state.session_start_time = datetime.now()
     st.session_state.workout_saved = False
     st.session_state.session_active = True
+    st.session_state.pop('exercise_engine', None)
 
 def end_session():
     """End the current session and clean up"""
@@ -105,6 +108,7 @@ def end_session():
         del st.session_state.workout_saved
     if 'session_active' in st.session_state:
         del st.session_state.session_active
+    st.session_state.pop('exercise_engine', None)
 
 def bicep_curl_tracker():
     """Main bicep curl tracking function with improved session management"""
@@ -202,193 +206,34 @@ def bicep_curl_tracker():
             st.error(f"❌ Error initializing camera: {str(e)}")
             return
 
-        # État des bras (local variables for frame-by-frame tracking)
-        right_arm_extended = True
-        left_arm_extended = True
+        # Informations de session dessinées sur chaque image
+        def draw_session_info(frame, engine, pose_angles):
+            if pose_angles is not None:
+                # Affichage des angles (debug info)
+                draw_text(frame, f"R: {int(pose_angles['right_elbow'])}°", (50, 250), 0.7, (255, 255, 255), 2)
+                draw_text(frame, f"L: {int(pose_angles['left_elbow'])}°", (50, 280), 0.7, (255, 255, 255), 2)
 
-        # Définition des couleurs pour le feedback (format BGR pour OpenCV)
-        COLOR_BLUE = (255, 0, 0)
-        COLOR_ORANGE = (0, 165, 255)
-        COLOR_GREEN = (0, 255, 0)
-        COLOR_RED = (0, 0, 255)
-
-        # Main video processing loop
-        frame_count = 0
-        
-        # Variables for tracking arm state across frames
-        right_arm_extended = True
-        left_arm_extended = True
-        
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                st.error("❌ Failed to capture frame from webcam.")
-                break
-            
-            # Check if session is still active
-            if not st.session_state.get('session_active', True):
-                break
-
-            frame = cv2.flip(frame, 1)
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            try:
-                results = pose.process(frame_rgb)
-            except Exception as e:
-                st.error(f"❌ Error processing pose: {str(e)}")
-                break
-
-            if results.pose_landmarks:
-                mp_drawing.draw_landmarks(
-                    frame, results.pose_landmarks, mp_pose.POSE_CONNECTIONS
-                )
-                landmarks = results.pose_landmarks.landmark
-
-                try:
-                    # --- Logique pour le Bras Droit ---
-                    right_shoulder = [
-                        landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].x,
-                        landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].y,
-                    ]
-                    right_elbow = [
-                        landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW.value].x,
-                        landmarks[mp_pose.PoseLandmark.RIGHT_ELBOW.value].y,
-                    ]
-                    right_wrist = [
-                        landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value].x,
-                        landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value].y,
-                    ]
-                    right_elbow_angle = calculate_angle(
-                        right_shoulder, right_elbow, right_wrist
-                    )
-
-                    # Feedback visuel pour le bras droit
-                    if right_elbow_angle > 150:
-                        feedback_right = "Right Arm Extended"
-                        color_right = COLOR_BLUE
-                        right_arm_extended = True
-                    elif right_elbow_angle < 50:  # Adjusted threshold for better detection
-                        feedback_right = "Good Right Curl!"
-                        color_right = COLOR_GREEN
-                        # Comptage de la répétition
-                        if right_arm_extended:
-                            st.session_state.right_rep_count += 1
-                            right_arm_extended = False
-                    else:
-                        feedback_right = "Curl More!"
-                        color_right = COLOR_ORANGE
-
-                    # --- Logique pour le Bras Gauche ---
-                    left_shoulder = [
-                        landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].x,
-                        landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].y,
-                    ]
-                    left_elbow = [
-                        landmarks[mp_pose.PoseLandmark.LEFT_ELBOW.value].x,
-                        landmarks[mp_pose.PoseLandmark.LEFT_ELBOW.value].y,
-                    ]
-                    left_wrist = [
-                        landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].x,
-                        landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value].y,
-                    ]
-                    left_elbow_angle = calculate_angle(left_shoulder, left_elbow, left_wrist)
-
-                    # Feedback visuel pour le bras gauche
-                    if left_elbow_angle > 150:
-                        feedback_left = "Left Arm Extended"
-                        color_left = COLOR_BLUE
-                        left_arm_extended = True
-                    elif left_elbow_angle < 50:  # Adjusted threshold for better detection
-                        feedback_left = "Good Left Curl!"
-                        color_left = COLOR_GREEN
-                        # Comptage de la répétition
-                        if left_arm_extended:
-                            st.session_state.left_rep_count += 1
-                            left_arm_extended = False
-                    else:
-                        feedback_left = "Curl More!"
-                        color_left = COLOR_ORANGE
-
-                    # --- Affichage sur l'écran ---
-                    # Affichage des feedbacks
-                    cv2.putText(
-                        frame, feedback_right, (50, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, color_right, 2
-                    )
-                    cv2.putText(
-                        frame, feedback_left, (50, 150),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, color_left, 2
-                    )
-
-                    # Affichage des angles (debug info)
-                    cv2.putText(
-                        frame, f"R: {int(right_elbow_angle)}°", (50, 250),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2
-                    )
-                    cv2.putText(
-                        frame, f"L: {int(left_elbow_angle)}°", (50, 280),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2
-                    )
-
-                    # Affichage des compteurs de répétitions
-                    cv2.putText(
-                        frame, f"Right Curls: {st.session_state.right_rep_count}",
-                        (50, 100), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 255), 2
-                    )
-                    cv2.putText(
-                        frame, f"Left Curls: {st.session_state.left_rep_count}",
-                        (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2
-                    )
-
-                except Exception as e:
-                    # If there's an error processing landmarks, show error on frame
-                    cv2.putText(
-                        frame, "Error processing pose", (50, 50),
-                        cv2.FONT_HERSHEY_SIMPLEX, 1, COLOR_RED, 2
-                    )
-
-            else:
-                # No pose detected
-                cv2.putText(
-                    frame, "No pose detected - Position yourself in view", (50, 50),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, COLOR_RED, 2
-                )
-
-            # Update sidebar metrics every 30 frames (~once per second)
-            # Note: Due to Streamlit's architecture, we'll show metrics on video frame
-            # and update session_state for when user interacts with buttons
-            
-            # Add session info directly on the video frame for real-time feedback
             current_duration = datetime.now() - st.session_state.session_start_time
             duration_minutes = int(current_duration.total_seconds() / 60)
             duration_seconds = int(current_duration.total_seconds() % 60)
             total_reps = st.session_state.right_rep_count + st.session_state.left_rep_count
-            
-            # Display session info on video frame
-            cv2.putText(
-                frame, f"Duration: {duration_minutes}:{duration_seconds:02d}", 
-                (frame.shape[1] - 300, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2
-            )
-            cv2.putText(
-                frame, f"Total Reps: {total_reps}", 
-                (frame.shape[1] - 300, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2
-            )
-            cv2.putText(
-                frame, f"R: {st.session_state.right_rep_count} | L: {st.session_state.left_rep_count}", 
-                (frame.shape[1] - 300, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2
-            )
 
-            # Affichage de l'image dans Streamlit
-            stframe.image(frame, channels="BGR", use_container_width=True)
-            
-            frame_count += 1
-            
-            # Small delay to prevent overwhelming the system
-            time.sleep(0.03)  # ~30 FPS
+            # Display session info on video frame (cached text: only redrawn when the value changes)
+            x = frame.shape[1] - 300
+            draw_text(frame, f"Duration: {duration_minutes}:{duration_seconds:02d}", (x, 50), 0.7, (255, 255, 255), 2)
+            draw_text(frame, f"Total Reps: {total_reps}", (x, 80), 0.7, (255, 255, 255), 2)
+            draw_text(frame, f"R: {st.session_state.right_rep_count} | L: {st.session_state.left_rep_count}", (x, 110), 0.7, (255, 255, 255), 2)
 
-        # Clean up
-        cap.release()
-        cv2.destroyAllWindows()
+        # Main video processing loop (shared rep-counting engine)
+        run_exercise_tracker(
+            BICEP_CURLS,
+            stframe=stframe,
+            cap=cap,
+            keep_running=lambda: st.session_state.get('session_active', True),
+            overlay=draw_session_info,
+            frame_delay=0.03,  # Small delay to prevent overwhelming the system
+            capture_error="❌ Failed to capture frame from webcam.",
+        )
 
 # Main function for the Streamlit page
 def main():
@@ -0,0 +1,89 @@
+# pose_angles.py
+import numpy as np
+
+# --- Indices des landmarks MediaPipe Pose (topologie fixe à 33 points) ---
+NUM_LANDMARKS = 33
+LANDMARK_INDEX = {
+    "LEFT_SHOULDER": 11, "RIGHT_SHOULDER": 12,
+    "LEFT_ELBOW": 13, "RIGHT_ELBOW": 14,
+    "LEFT_WRIST": 15, "RIGHT_WRIST": 16,
+    "LEFT_HIP": 23, "RIGHT_HIP": 24,
+    "LEFT_KNEE": 25, "RIGHT_KNEE": 26,
+    "LEFT_ANKLE": 27, "RIGHT_ANKLE": 28,
+}
+
+# --- Table déclarative des angles articulaires : (point A, sommet, point C) ---
+JOINT_ANGLES = {
+    "left_elbow": ("LEFT_SHOULDER", "LEFT_ELBOW", "LEFT_WRIST"),
+    "right_elbow": ("RIGHT_SHOULDER", "RIGHT_ELBOW", "RIGHT_WRIST"),
+    "left_shoulder": ("LEFT_ELBOW", "LEFT_SHOULDER", "LEFT_HIP"),
+    "right_shoulder": ("RIGHT_ELBOW", "RIGHT_SHOULDER", "RIGHT_HIP"),
+    "left_hip": ("LEFT_SHOULDER", "LEFT_HIP", "LEFT_KNEE"),
+    "right_hip": ("RIGHT_SHOULDER", "RIGHT_HIP", "RIGHT_KNEE"),
+    "left_knee": ("LEFT_HIP", "LEFT_KNEE", "LEFT_ANKLE"),
+    "right_knee": ("RIGHT_HIP", "RIGHT_KNEE", "RIGHT_ANKLE"),
+}
+
+
+def landmarks_to_array(pose_landmarks, out=None):
+    """Copy a MediaPipe landmark list into a (33, 4) float32 array of x, y, z, visibility."""
+    if out is None:
+        out = np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+    # Écriture ligne par ligne dans `out` : pas de liste intermédiaire de 132 flottants
+    for i, lm in enumerate(pose_landmarks.landmark):
+        out[i] = lm.x, lm.y, lm.z, lm.visibility
+    return out
+
+
+class PoseAngles:
+    """Computes every joint angle of JOINT_ANGLES in one vectorized pass.
+
+    All buffers are allocated once, so `update()` does no per-joint
+    allocation. Angles are in degrees within [0, 180].
+    """
+
+    def __init__(self, table: dict = None):
+        table = JOINT_ANGLES if table is None else table
+        self.names = tuple(table)
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        # Ordre (A, C, sommet) pour que les vecteurs soient des vues contiguës
+        self._triplets = np.array(
+            [[LANDMARK_INDEX[a], LANDMARK_INDEX[c], LANDMARK_INDEX[b]] for a, b, c in table.values()],
+            dtype=np.intp,
+        )
+
+        n = len(self.names)
+        self.landmarks = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+        self.angles = np.zeros(n, dtype=np.float32)
+        self._points = np.empty((n, 3, 2), dtype=np.float32)
+        self._vectors = np.empty((n, 2, 2), dtype=np.float32)
+        self._theta = np.empty((n, 2), dtype=np.float32)
+        self._reflex = np.empty(n, dtype=bool)
+
+    def update(self, pose_landmarks) -> np.ndarray:
+        """Load a MediaPipe landmark list and recompute all angles"""
+        landmarks_to_array(pose_landmarks, out=self.landmarks)
+        return self.compute()
+
+    def update_array(self, landmarks: np.ndarray) -> np.ndarray:
+        """Load an existing (33, 4) landmark array and recompute all angles"""
+        np.copyto(self.landmarks, landmarks, casting="same_kind")
+        return self.compute()
+
+    def compute(self) -> np.ndarray:
+        """Recompute all angles from the current landmark buffer"""
+        np.take(self.landmarks[:, :2], self._triplets, axis=0, out=self._points)
+        np.subtract(self._points[:, :2], self._points[:, 2:3], out=self._vectors)
+        np.arctan2(self._vectors[..., 1], self._vectors[..., 0], out=self._theta)
+
+        angles = self.angles
+        np.subtract(self._theta[:, 1], self._theta[:, 0], out=angles)
+        np.degrees(angles, out=angles)
+        np.abs(angles, out=angles)
+        np.greater(angles, 180.0, out=self._reflex)
+        np.subtract(360.0, angles, out=angles, where=self._reflex)
+        return angles
+
+    def __getitem__(self, name: str) -> float:
+        return float(self.angles[self.index[name]])
@@ -0,0 +1,121 @@
+# pose_pool.py
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """Raised when no instance frees up within the checkout timeout."""
+
+
+class PosePool:
+    """Bounded pool of pose estimator instances shared by all sessions of the process.
+
+    Instances are created lazily by `factory()` up to `size`. A session
+    checks one out for the length of a tracker run, so no two sessions ever
+    call the same instance concurrently, and `release()` calls the
+    instance's `reset()` (if it has one) before the next session gets it,
+    so no tracking state carries over from one user to the next. An
+    instance whose reset fails is dropped; the pool builds a new one.
+    """
+
+    def __init__(self, factory, size: int = 4, timeout: float = 10.0):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0  # Sessions bloquées dans acquire() en ce moment
+
+        # Métriques de saturation
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_seconds = 0.0
+        self._peak_in_use = 0
+
+    def acquire(self, timeout: float = None):
+        """Take an instance, creating one if the pool is not full, else waiting up to `timeout` seconds"""
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        create = False
+
+        with self._cond:
+            if not self._idle and self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                if not self._idle:
+                    self._waits += 1
+                self._waiting += 1
+                try:
+                    available = self._cond.wait_for(lambda: self._idle, timeout)
+                finally:
+                    self._waiting -= 1
+                if not available:
+                    self._timeouts += 1
+                    raise PoolTimeout(f"No pose estimator available after {timeout:g}s ({self.size} in use)")
+                instance = self._idle.pop()
+            self._checkout_started(started)
+
+        if create:
+            try:
+                instance = self.factory()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+        return instance
+
+    def _checkout_started(self, started: float):
+        self._checkouts += 1
+        self._in_use += 1
+        self._peak_in_use = max(self._peak_in_use, self._in_use)
+        self._wait_seconds += time.monotonic() - started
+
+    def release(self, instance):
+        """Reset an instance's tracking state and return it to the pool"""
+        reset = getattr(instance, "reset", None)
+        try:
+            if reset is not None:
+                reset()
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._created -= 1
+                self._cond.notify()
+            return
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append(instance)
+            self._cond.notify()
+
+    @contextmanager
+    def checkout(self, timeout: float = None):
+        instance = self.acquire(timeout)
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+    def metrics(self) -> dict:
+        """Snapshot of pool usage and saturation counters"""
+        with self._cond:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "saturation": self._in_use / self.size if self.size else 1.0,
+                "peak_in_use": self._peak_in_use,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": 1000 * self._wait_seconds / self._checkouts if self._checkouts else 0.0,
+            }
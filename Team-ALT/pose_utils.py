@@ -1,21 +1,27 @@
 # pose_utils.py
+import functools
+import os
+import threading
+
+import cv2
 import mediapipe as mp
-import numpy as np
-import math
 
-# --- Initialisation de MediaPipe Pose (une seule fois) ---
-mp_pose = mp.solutions.pose
-pose = mp_pose.Pose()
-mp_drawing = mp.solutions.drawing_utils
+from pose_pool import PosePool
+
+# --- Pool d'instances MediaPipe Pose (une par session active) ---
+POSE_POOL_SIZE = int(os.environ.get("FORMFIT_POSE_POOL_SIZE", "4"))
+POSE_POOL_TIMEOUT = float(os.environ.get("FORMFIT_POSE_POOL_TIMEOUT", "10"))
+
+_pose_pools = {}
+_pose_pool_lock = threading.Lock()
 
-# --- Fonction de calcul d'angle (partagée) ---
-def calculate_angle(a, b, c):
-    """Calcule l'angle entre trois points."""
-    a = np.array(a)  # Premier point
-    b = np.array(b)  # Point du milieu (sommet de l'angle)
-    c = np.array(c)  # Troisième point
 
-    radians = math.atan2(c[1] - b[1], c[0] - b[0]) - math.atan2(a[1] - b[1], a[0] - b[0])
-    angle = abs(radians * 180.0 / np.pi)
+def get_pose_pool(model_complexity: int = 1) -> PosePool:
+    """Process-wide pool of Pose instances for one model_complexity, created on first use"""
+    with _pose_pool_lock:
+        pool = _pose_pools.get(model_complexity)
+        if pool is None:
+            factory = functools.partial(mp.solutions.pose.Pose, model_complexity=model_complexity)
+            pool = _pose_pools[model_complexity] = PosePool(factory, size=POSE_POOL_SIZE, timeout=POSE_POOL_TIMEOUT)
+        return pool
 
-    return 360 - angle if angle > 180 else angle
\ No newline at end of file
@@ -0,0 +1,167 @@
+# quality_control.py
+import time
+
+import cv2
+
+from frame_buffers import ScratchBuffer
+from pose_angles import landmarks_to_array
+from pose_pool import PoolTimeout
+
+# --- Niveaux de qualité, du moins cher au plus précis : (model_complexity, plus grand côté en pixels) ---
+QUALITY_LEVELS = (
+    (0, 256),
+    (0, 384),
+    (1, 384),
+    (1, 640),
+    (2, 640),
+)
+# Les landmarks sont lissés (landmark_filter.py) : on démarre sur le modèle léger
+DEFAULT_LEVEL = 1
+
+
+class LatencyController:
+    """Steps the quality level down when inference is too slow for `target_fps`, and up when there is headroom.
+
+    Hysteresis: stepping down needs the smoothed latency above the frame
+    budget for `patience` frames, stepping up needs it below `up_ratio` of
+    the budget for `patience` frames, and no change happens during the
+    `cooldown` frames after a switch. A level that had to be abandoned is
+    blocked for a back-off period that doubles each time, so the controller
+    settles instead of oscillating between two levels.
+    """
+
+    def __init__(self, target_fps: float = 20.0, levels: tuple = QUALITY_LEVELS, start_level: int = DEFAULT_LEVEL,
+                 alpha: float = 0.2, up_ratio: float = 0.6, patience: int = 15, cooldown: int = 30):
+        self.levels = levels
+        self.level = min(start_level, len(levels) - 1)
+        self.budget = 1.0 / target_fps
+        self.alpha = alpha
+        self.up_ratio = up_ratio
+        self.patience = patience
+        self.cooldown = cooldown
+
+        self.latency = None  # Moyenne mobile exponentielle, en secondes
+        self.switches = 0
+        self._frame = 0
+        self._over = 0
+        self._under = 0
+        self._cooldown_left = 0
+        self._blocked_until = [0] * len(levels)
+        self._backoff = [cooldown * 4] * len(levels)
+
+    @property
+    def setting(self) -> tuple:
+        return self.levels[self.level]
+
+    def update(self, latency: float) -> int:
+        """Feed one inference latency (seconds) and return the level to use next"""
+        self._frame += 1
+        self.latency = latency if self.latency is None else self.latency + self.alpha * (latency - self.latency)
+        if self._cooldown_left > 0:
+            self._cooldown_left -= 1
+            return self.level
+
+        self._over = self._over + 1 if self.latency > self.budget and self.level > 0 else 0
+        can_step_up = self.level < len(self.levels) - 1 and self._frame >= self._blocked_until[self.level + 1]
+        self._under = self._under + 1 if self.latency < self.budget * self.up_ratio and can_step_up else 0
+
+        if self._over >= self.patience:
+            # Ce niveau est trop lent : on le bloque de plus en plus longtemps
+            self._blocked_until[self.level] = self._frame + self._backoff[self.level]
+            self._backoff[self.level] *= 2
+            self._switch(self.level - 1)
+        elif self._under >= self.patience:
+            self._switch(self.level + 1)
+        return self.level
+
+    def reject(self, previous_level: int):
+        """Undo a switch the caller could not apply (e.g. no model instance available)"""
+        self.level = previous_level
+        self._cooldown_left = self.cooldown
+
+    def _switch(self, level: int):
+        self.level = level
+        self.switches += 1
+        self.latency = None
+        self._over = self._under = 0
+        self._cooldown_left = self.cooldown
+
+
+class AdaptiveQualityEstimator:
+    """Pipeline inference stage that tunes model_complexity and input resolution to hold a target frame rate.
+
+    `get_pool(model_complexity)` must return the PosePool serving that
+    complexity; the estimator keeps one instance checked out at a time and
+    swaps it only when the controller changes complexity. With a `roi`
+    tracker, inference runs on the region around the previous pose instead
+    of the whole frame, and landmarks are mapped back to the full frame.
+    """
+
+    def __init__(self, get_pool, controller: LatencyController, timeout: float = None, roi=None):
+        self.get_pool = get_pool
+        self.controller = controller
+        self.roi = roi
+        self.complexity, self.max_side = controller.setting
+        self.pose = get_pool(self.complexity).acquire(timeout)
+        # Tampons de sortie réutilisés d'une image à l'autre (réalloués seulement si la taille change)
+        self._small = ScratchBuffer()
+        self._rgb = ScratchBuffer()
+
+    def _resize(self, frame):
+        height, width = frame.shape[:2]
+        scale = self.max_side / max(height, width)
+        if scale >= 1.0:
+            return frame
+        size = (int(width * scale), int(height * scale))
+        return self._small.keep(cv2.resize(frame, size, dst=self._small.array, interpolation=cv2.INTER_AREA))
+
+    @property
+    def allocations(self) -> int:
+        """Number of times the resize/colour-conversion buffers had to be (re)allocated"""
+        return self._small.allocations + self._rgb.allocations
+
+    def __call__(self, frame, timestamp=None):
+        """Run pose estimation on a BGR frame and return its (33, 4) landmark array, or None."""
+        started = time.perf_counter()
+        image, box = self.roi.crop(frame) if self.roi is not None else (frame, None)
+        rgb = self._rgb.keep(cv2.cvtColor(self._resize(image), cv2.COLOR_BGR2RGB, dst=self._rgb.array))
+        results = self.pose.process(rgb)
+        previous_level = self.controller.level
+        level = self.controller.update(time.perf_counter() - started)
+        if level != previous_level:
+            self._apply(previous_level)
+
+        landmarks = None
+        if results.pose_landmarks:
+            landmarks = landmarks_to_array(results.pose_landmarks)
+        if self.roi is not None:
+            if landmarks is not None:
+                self.roi.to_frame(landmarks, box, frame.shape)
+            self.roi.observe(landmarks)
+        return landmarks
+
+    def _apply(self, previous_level: int):
+        complexity, max_side = self.controller.setting
+        if complexity != self.complexity:
+            try:
+                pose = self.get_pool(complexity).acquire(timeout=0)
+            except PoolTimeout:
+                self.controller.reject(previous_level)
+                return
+            self.get_pool(self.complexity).release(self.pose)
+            self.pose = pose
+            self.complexity = complexity
+        self.max_side = max_side
+
+    def close(self):
+        """Return the checked-out instance to its pool"""
+        if self.pose is not None:
+            self.get_pool(self.complexity).release(self.pose)
+            self.pose = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,82 @@
+# roi_tracking.py
+import numpy as np
+
+from overlay import VISIBILITY_THRESHOLD
+
+
+class RoiTracker:
+    """Chooses the region of the next frame to run pose inference on.
+
+    The region is the bounding box of the last frame's visible landmarks,
+    grown by `margin` of its size on every side. It is sticky: it only moves
+    when the body gets close to its edges or becomes much smaller than it,
+    so MediaPipe's own frame-to-frame tracking sees a stable input. When
+    tracking is lost the next inference runs on the full frame.
+    """
+
+    def __init__(self, margin: float = 0.25, min_size: float = 0.2, min_visible: int = 8,
+                 refit_ratio: float = 0.4):
+        self.margin = margin
+        self.min_size = min_size  # fraction minimale de l'image sur chaque axe
+        self.min_visible = min_visible
+        self.refit_ratio = refit_ratio
+
+        self.region = None  # (x0, y0, x1, y1) en coordonnées normalisées, None = image entière
+        self.full_frame_searches = 0
+
+    def crop(self, frame):
+        """Return (view of the region to infer on, pixel box or None for the full frame)"""
+        if self.region is None:
+            self.full_frame_searches += 1
+            return frame, None
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = self.region
+        box = (int(x0 * width), int(y0 * height), int(np.ceil(x1 * width)), int(np.ceil(y1 * height)))
+        return frame[box[1]:box[3], box[0]:box[2]], box
+
+    @staticmethod
+    def to_frame(landmarks, box, frame_shape):
+        """Map landmarks normalized to the crop `box` back to full-frame coordinates, in place"""
+        if box is None:
+            return landmarks
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = box
+        scale_x = (x1 - x0) / width
+        landmarks[:, 0] = landmarks[:, 0] * scale_x + x0 / width
+        landmarks[:, 1] = landmarks[:, 1] * ((y1 - y0) / height) + y0 / height
+        landmarks[:, 2] *= scale_x  # z suit l'échelle de x
+        return landmarks
+
+    def observe(self, landmarks):
+        """Update the region from full-frame landmarks (None when no pose was found)"""
+        if landmarks is None:
+            self.region = None
+            return
+        visible = landmarks[:, 3] >= VISIBILITY_THRESHOLD
+        if np.count_nonzero(visible) < self.min_visible:
+            self.region = None
+            return
+
+        points = landmarks[visible, :2]
+        bx0, by0 = points.min(axis=0)
+        bx1, by1 = points.max(axis=0)
+        if self.region is not None and self._still_fits(bx0, by0, bx1, by1):
+            return
+
+        # Nouvelle région : boîte englobante + marge, taille minimale, bornée à l'image
+        pad_x = max((bx1 - bx0) * self.margin, (self.min_size - (bx1 - bx0)) / 2)
+        pad_y = max((by1 - by0) * self.margin, (self.min_size - (by1 - by0)) / 2)
+        region = (max(bx0 - pad_x, 0.0), max(by0 - pad_y, 0.0), min(bx1 + pad_x, 1.0), min(by1 + pad_y, 1.0))
+        self.region = None if region == (0.0, 0.0, 1.0, 1.0) else tuple(float(v) for v in region)
+
+    def _still_fits(self, bx0, by0, bx1, by1) -> bool:
+        x0, y0, x1, y1 = self.region
+        # Les landmarks doivent rester à l'écart des bords de la région...
+        inner_x = (x1 - x0) * self.margin / (1 + 2 * self.margin)
+        inner_y = (y1 - y0) * self.margin / (1 + 2 * self.margin)
+        if (bx0 < x0 + inner_x / 2 and x0 > 0) or (by0 < y0 + inner_y / 2 and y0 > 0):
+            return False
+        if (bx1 > x1 - inner_x / 2 and x1 < 1) or (by1 > y1 - inner_y / 2 and y1 < 1):
+            return False
+        # ...et le corps ne doit pas être devenu beaucoup plus petit que la région
+        return (bx1 - bx0) * (by1 - by0) >= self.refit_ratio * (x1 - x0) * (y1 - y0) / (1 + 2 * self.margin) ** 2
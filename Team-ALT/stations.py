@@ -0,0 +1,318 @@
+# stations.py
+"""Multi-station server: one process counting reps on N cameras.
+
+Each station has its own capture thread, pose instance (pose tracking is
+per stream) and ExerciseEngine; pose inference runs on a bounded pool of
+worker threads shared by all stations. A station with a fresh frame waits
+in a round-robin queue, and a worker takes one frame from it before moving
+to the next station, so a busy camera cannot starve the others. Each
+station keeps only its latest frame: when the workers fall behind, stale
+frames are dropped rather than queued.
+
+    python stations.py --station "rack1,0,Squats" --station "rack2,rtsp://10.0.0.12/stream,Deadlift" --workers 4 --stream
+"""
+import argparse
+import collections
+import contextlib
+import functools
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+from adaptive_inference import AdaptiveInference, AdaptiveScheduler
+from exercise_engine import ExerciseEngine
+from exercises import EXERCISES
+from frame_buffers import FrameBufferPool
+from frame_pipeline import LatestQueue
+from landmark_filter import OneEuroFilter
+from overlay import draw_pose, draw_rule_overlay
+from pose_angles import PoseAngles
+from pose_pool import PosePool
+from quality_control import AdaptiveQualityEstimator, LatencyController
+from roi_tracking import RoiTracker
+
+# Lissage des métriques de cadence
+RATE_ALPHA = 0.1
+
+
+def create_pose(model_complexity: int = 1):
+    """Build a MediaPipe Pose in video (tracking) mode"""
+    import mediapipe as mp
+    return mp.solutions.pose.Pose(static_image_mode=False, model_complexity=model_complexity)
+
+
+def _is_file(source) -> bool:
+    return isinstance(source, str) and "://" not in source and os.path.exists(source)
+
+
+class _Rate:
+    """Events per second, smoothed over recent intervals"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._last = None
+
+    def tick(self, now: float):
+        if self._last is not None and now > self._last:
+            instant = 1.0 / (now - self._last)
+            self.value = instant if not self.value else self.value + RATE_ALPHA * (instant - self.value)
+        self._last = now
+
+
+class Station:
+    """One camera, its exercise and its rep-counting state."""
+
+    def __init__(self, name: str, source, definition, inference=None, mirror: bool = True):
+        self.name = name
+        self.source = source
+        self.definition = definition
+        self.inference = inference
+        self.mirror = mirror
+
+        self.engine = ExerciseEngine(definition)
+        self.pose_angles = PoseAngles()
+        self.smoother = OneEuroFilter.for_exercise(definition)
+        self.buffers = FrameBufferPool(max_free=3)
+        self.slot = LatestQueue(1, on_drop=lambda item: self.buffers.release(item[0]))
+        self.channel = None  # Canal MJPEG optionnel pour visualiser la station
+
+        self.cap = None
+        self.capture_failed = False
+        self.error = None
+        self.queued = False  # Présente dans la file des stations prêtes (protégé par le verrou du manager)
+        self.busy = False
+
+        # Métriques
+        self.captured = 0
+        self.processed = 0
+        self.capture_rate = _Rate()
+        self.process_rate = _Rate()
+        self.inference_seconds = 0.0
+
+    def capture_loop(self, stop: threading.Event, ready):
+        """Read frames into the station's latest-frame slot until stopped (capture thread)"""
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            self.capture_failed = True
+            self.error = IOError(f"Could not open source: {self.source}")
+            return
+        # Un fichier vidéo est lu à sa cadence nominale, comme une caméra
+        interval = 1.0 / (self.cap.get(cv2.CAP_PROP_FPS) or 30.0) if _is_file(self.source) else 0.0
+        shape = None
+        next_read = time.monotonic()
+        while not stop.is_set():
+            buffer = self.buffers.acquire(shape) if shape is not None else None
+            ret, frame = self.cap.read(buffer)
+            timestamp = time.monotonic()
+            if not ret:
+                self.capture_failed = True
+                break
+            if frame is not buffer:
+                shape = self.buffers.adopt(frame).shape
+            if self.mirror:
+                cv2.flip(frame, 1, dst=frame)
+            self.captured += 1
+            self.capture_rate.tick(timestamp)
+            self.slot.put((frame, timestamp))
+            ready(self)
+            if interval:
+                next_read += interval
+                time.sleep(max(0.0, next_read - time.monotonic()))
+        self.cap.release()
+
+    def process(self, frame, timestamp: float):
+        """Run inference and rep counting on one frame (worker thread)"""
+        started = time.perf_counter()
+        landmarks = self.smoother(self.inference(frame, timestamp), timestamp)
+        self.inference_seconds += time.perf_counter() - started
+        if landmarks is not None:
+            self.engine.step(self.pose_angles.update_array(landmarks), timestamp)
+        if self.channel is not None:
+            if landmarks is not None:
+                draw_pose(frame, landmarks)
+                draw_rule_overlay(frame, self.engine, timestamp)
+            self.channel.publish(frame)
+        self.processed += 1
+        self.process_rate.tick(time.monotonic())
+
+    def metrics(self) -> dict:
+        return {
+            "source": str(self.source),
+            "exercise": self.definition.name,
+            "counts": {rule.name: state.count for rule, state in zip(self.definition.rules, self.engine.states)},
+            "capture_fps": round(self.capture_rate.value, 1),
+            "process_fps": round(self.process_rate.value, 1),
+            "queue_depth": len(self.slot),
+            "dropped": self.slot.dropped,
+            "captured": self.captured,
+            "processed": self.processed,
+            "avg_inference_ms": round(1000 * self.inference_seconds / self.processed, 1) if self.processed else 0.0,
+            "error": str(self.error) if self.error else None,
+        }
+
+
+class StationManager:
+    """Runs N stations on `workers` shared inference threads with round-robin scheduling."""
+
+    def __init__(self, workers: int = 2, pose_factory=create_pose, target_fps: float = 15.0):
+        self.workers = workers
+        self.pose_factory = pose_factory
+        self.target_fps = target_fps
+        self.stations = {}
+
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        self._ready = collections.deque()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+        self._resources = contextlib.ExitStack()
+
+    def _get_pool(self, model_complexity: int) -> PosePool:
+        # Une instance Pose par station et par complexité au plus
+        with self._pools_lock:
+            if model_complexity not in self._pools:
+                factory = functools.partial(self.pose_factory, model_complexity)
+                self._pools[model_complexity] = PosePool(factory, size=max(1, len(self.stations)))
+            return self._pools[model_complexity]
+
+    def add_station(self, name: str, source, exercise: str, mirror: bool = True) -> Station:
+        """Register a station; must be called before start()"""
+        if name in self.stations:
+            raise ValueError(f"Station {name!r} already exists")
+        definition = EXERCISES[exercise]
+        # L'estimateur est créé au démarrage, quand le nombre de stations est connu
+        station = Station(name, source, definition, mirror=mirror)
+        self.stations[name] = station
+        return station
+
+    def _mark_ready(self, station: Station):
+        with self._cond:
+            if not station.queued and not station.busy and station.error is None:
+                station.queued = True
+                self._ready.append(station)
+                self._cond.notify()
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._ready or self._stop.is_set())
+                if self._stop.is_set():
+                    return
+                station = self._ready.popleft()
+                station.queued = False
+                station.busy = True
+            try:
+                frame, timestamp = station.slot.get(timeout=0)
+            except queue.Empty:
+                frame = None
+            if frame is not None:
+                try:
+                    station.process(frame, timestamp)
+                except Exception as e:
+                    station.error = e
+                station.buffers.release(frame)
+            with self._cond:
+                station.busy = False
+                # Une nouvelle image est arrivée pendant le traitement : retour en fin de file
+                if len(station.slot) and station.error is None:
+                    station.queued = True
+                    self._ready.append(station)
+                    self._cond.notify()
+
+    def start(self, stream_server=None):
+        """Create each station's estimator, then start capture threads and the worker pool"""
+        for station in self.stations.values():
+            estimator = self._resources.enter_context(
+                AdaptiveQualityEstimator(self._get_pool, LatencyController(self.target_fps), roi=RoiTracker())
+            )
+            station.inference = AdaptiveInference(estimator, AdaptiveScheduler(max_skip=station.definition.max_skip))
+            if stream_server is not None:
+                station.channel = self._resources.enter_context(stream_server.open_channel(f"station-{station.name}"))
+        for station in self.stations.values():
+            thread = threading.Thread(target=station.capture_loop, args=(self._stop, self._mark_ready), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """Stop every thread and return the pose instances to their pools"""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+        self._resources.close()
+
+    def metrics(self) -> dict:
+        """Per-station FPS, queue depth and counts, plus scheduler state"""
+        with self._cond:
+            ready = len(self._ready)
+        return {
+            "workers": self.workers,
+            "ready_queue": ready,
+            "stations": {name: station.metrics() for name, station in self.stations.items()},
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+def parse_station(spec: str):
+    """Parse "name,source,exercise"; a numeric source is a capture device index"""
+    name, rest = spec.split(",", 1)
+    source, exercise = rest.rsplit(",", 1)
+    return name, (int(source) if source.isdigit() else source), exercise
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count reps on several cameras with a shared inference worker pool.")
+    parser.add_argument("--station", action="append", required=True, metavar="NAME,SOURCE,EXERCISE",
+                        help="Camera index, RTSP URL or video file, and its exercise (repeatable)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Inference threads")
+    parser.add_argument("--target-fps", type=float, default=15.0, help="Per-station inference rate to aim for")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between metric reports")
+    parser.add_argument("--no-mirror", action="store_true", help="Do not flip frames horizontally")
+    parser.add_argument("--stream", action="store_true", help="Publish each annotated station on the MJPEG server")
+    args = parser.parse_args()
+
+    manager = StationManager(workers=args.workers, target_fps=args.target_fps)
+    for spec in args.station:
+        name, source, exercise = parse_station(spec)
+        if exercise not in EXERCISES:
+            parser.error(f"Unknown exercise {exercise!r} (choose from {', '.join(EXERCISES)})")
+        manager.add_station(name, source, exercise, mirror=not args.no_mirror)
+
+    server = None
+    if args.stream:
+        from video_stream import get_stream_server
+        server = get_stream_server()
+        for name in manager.stations:
+            print(f"{name}: {server.url(f'station-{name}')}")
+
+    with manager.start(server):
+        try:
+            while any(not s.capture_failed for s in manager.stations.values()):
+                time.sleep(args.interval)
+                for name, m in manager.metrics()["stations"].items():
+                    print(f"{name:12s} {m['capture_fps']:5.1f} fps in  {m['process_fps']:5.1f} fps out  "
+                          f"queue {m['queue_depth']}  dropped {m['dropped']:5d}  "
+                          f"{m['avg_inference_ms']:5.1f} ms  {m['counts']}" + (f"  {m['error']}" if m['error'] else ""))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# Les modules de l'application sont à plat dans Team-ALT : on les rend importables depuis les tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
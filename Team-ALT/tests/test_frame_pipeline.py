@@ -0,0 +1,69 @@
+# tests/test_frame_pipeline.py
+import queue
+import threading
+
+import numpy as np
+import pytest
+
+from frame_pipeline import FramePipeline, LatestQueue
+
+
+class FakeCapture:
+    """VideoCapture stand-in producing `count` frames (forever when None), then failing"""
+
+    def __init__(self, count=None, shape=(4, 6, 3)):
+        self.count = count
+        self.shape = shape
+        self.reads = 0
+
+    def read(self):
+        if self.count is not None and self.reads >= self.count:
+            return False, None
+        self.reads += 1
+        return True, np.full(self.shape, self.reads % 256, np.uint8)
+
+
+def test_latest_queue_drops_oldest():
+    q = LatestQueue(2)
+    for item in range(5):
+        q.put(item)
+    assert q.dropped == 3
+    assert [q.get(timeout=0), q.get(timeout=0)] == [3, 4]
+    with pytest.raises(queue.Empty):
+        q.get(timeout=0)
+
+
+def test_latest_queue_get_wakes_on_put():
+    q = LatestQueue(1)
+    threading.Timer(0.05, q.put, args=("frame",)).start()
+    assert q.get(timeout=2.0) == "frame"
+
+
+def test_pipeline_ends_when_capture_fails():
+    with FramePipeline(FakeCapture(count=5), lambda frame, ts: None, queue_size=8) as pipeline:
+        yielded = [int(frame[0, 0, 0]) for frame, _, _ in pipeline.frames(poll_interval=0.01)]
+    assert pipeline.capture_failed
+    assert pipeline.error is None
+    # La fin de capture arrête aussi l'inférence : les images encore en file peuvent être abandonnées
+    assert yielded == sorted(set(yielded)) and set(yielded) <= {1, 2, 3, 4, 5}
+
+
+def test_pipeline_stops_on_processing_error():
+    def process(frame, timestamp):
+        raise ValueError("boom")
+
+    with FramePipeline(FakeCapture(), process) as pipeline:
+        frames = list(pipeline.frames(poll_interval=0.01))
+    assert frames == []
+    assert isinstance(pipeline.error, ValueError)
+    assert not pipeline.running
+
+
+def test_pipeline_stop_joins_both_stages():
+    pipeline = FramePipeline(FakeCapture(), lambda frame, ts: None).start()
+    for count, _ in enumerate(pipeline.frames(poll_interval=0.01)):
+        if count == 20:
+            break
+    pipeline.stop()
+    assert pipeline._threads == []
+    assert not pipeline.running
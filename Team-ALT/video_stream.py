@@ -0,0 +1,219 @@
+# video_stream.py
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+# --- Configuration du flux vidéo ---
+# Boucle locale par défaut : le flux webcam n'est pas authentifié. Pour servir des navigateurs
+# distants, FORMFIT_STREAM_HOST=0.0.0.0 (derrière un proxy authentifié) et une FORMFIT_STREAM_URL qu'ils atteignent.
+STREAM_HOST = os.environ.get("FORMFIT_STREAM_HOST", "127.0.0.1")
+STREAM_PORT = int(os.environ.get("FORMFIT_STREAM_PORT", "8765"))
+STREAM_URL = os.environ.get("FORMFIT_STREAM_URL", f"http://localhost:{STREAM_PORT}")
+JPEG_QUALITY = int(os.environ.get("FORMFIT_JPEG_QUALITY", "70"))
+PREVIEW_WIDTH = int(os.environ.get("FORMFIT_PREVIEW_WIDTH", "640"))
+
+BOUNDARY = "formfitframe"
+
+
+class StreamChannel:
+    """Latest-frame slot for one tracker session, encoded on demand for its viewers.
+
+    `publish()` only copies the frame (downscaled to the preview width) when
+    a viewer is waiting for a newer one, so the encoded frame rate follows
+    what clients actually consume and nobody watching costs nothing.
+    """
+
+    def __init__(self, stream_id: str, encoder, preview_width: int = PREVIEW_WIDTH):
+        self.stream_id = stream_id
+        self.encoder = encoder
+        self.preview_width = preview_width
+        self.closed = False
+
+        self._cond = threading.Condition()
+        self._raw = None
+        self._pending = False
+        self._jpeg = None
+        self._sequence = 0
+        self._waiting = 0
+
+        # Métriques
+        self.published = 0
+        self.skipped = 0
+        self.encoded = 0
+        self.sent = 0
+
+    def publish(self, frame):
+        """Offer a rendered BGR frame; cheap no-op when no viewer wants a new one"""
+        with self._cond:
+            if not self._waiting:
+                self.skipped += 1
+                return
+            height, width = frame.shape[:2]
+            scale = min(1.0, self.preview_width / width)
+            size = (int(width * scale), int(height * scale))
+            if self._raw is None or self._raw.shape[:2] != size[::-1]:
+                self._raw = None
+            # Copie réduite dans le tampon du canal, réutilisé d'une image à l'autre
+            self._raw = cv2.resize(frame, size, dst=self._raw, interpolation=cv2.INTER_AREA) if scale < 1.0 \
+                else cv2.copyTo(frame, None, self._raw)
+            self.published += 1
+            already_pending = self._pending
+            self._pending = True
+        if not already_pending:
+            self.encoder.submit(self)
+
+    def encode_pending(self, quality: int):
+        """Encode the pending frame (encoder thread only)"""
+        with self._cond:
+            if not self._pending or self._raw is None:
+                return
+            raw = self._raw
+            self._raw = None  # Le prochain publish() écrit dans un nouveau tampon
+            self._pending = False
+        ok, jpeg = cv2.imencode(".jpg", raw, (cv2.IMWRITE_JPEG_QUALITY, quality))
+        if not ok:
+            return
+        with self._cond:
+            if self._raw is None:
+                self._raw = raw  # Rend le tampon pour la prochaine image
+            self._jpeg = jpeg.tobytes()
+            self._sequence += 1
+            self.encoded += 1
+            self._cond.notify_all()
+
+    def next_jpeg(self, after: int, timeout: float = 1.0):
+        """Wait for a frame newer than sequence `after`; return (sequence, jpeg) or None on timeout/close"""
+        with self._cond:
+            self._waiting += 1
+            try:
+                if not self._cond.wait_for(lambda: self.closed or self._sequence > after, timeout):
+                    return None
+                if self.closed:
+                    return None
+                self.sent += 1
+                return self._sequence, self._jpeg
+            finally:
+                self._waiting -= 1
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        return {
+            "published": self.published,
+            "skipped": self.skipped,
+            "encoded": self.encoded,
+            "sent": self.sent,
+            "viewers_waiting": self._waiting,
+        }
+
+
+class FrameEncoder:
+    """Single JPEG encoder thread shared by every channel of the process."""
+
+    def __init__(self, quality: int = JPEG_QUALITY):
+        self.quality = quality
+        self._queue = []
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, channel: StreamChannel):
+        with self._cond:
+            self._queue.append(channel)
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue)
+                channel = self._queue.pop(0)
+            channel.encode_pending(self.quality)
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    """Serves /stream/<id> as multipart/x-mixed-replace (MJPEG)."""
+
+    def do_GET(self):
+        prefix = "/stream/"
+        channel = self.server.channels.get(self.path[len(prefix):].split("?")[0]) \
+            if self.path.startswith(prefix) else None
+        if channel is None:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-cache, no-store")
+        self.end_headers()
+
+        sequence = 0
+        try:
+            while not channel.closed:
+                item = channel.next_jpeg(sequence)
+                if item is None:
+                    continue
+                # L'écriture bloque tant que le client n'a pas lu : c'est ce qui règle la cadence
+                sequence, jpeg = item
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode()
+                )
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StreamServer:
+    """MJPEG HTTP server plus the shared encoder, started once per process."""
+
+    def __init__(self, port: int = STREAM_PORT, base_url: str = STREAM_URL, quality: int = JPEG_QUALITY,
+                 host: str = STREAM_HOST):
+        self.base_url = base_url.rstrip("/")
+        self.encoder = FrameEncoder(quality)
+        self.httpd = ThreadingHTTPServer((host, port), _StreamHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.channels = {}
+        self.started = time.monotonic()
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @contextmanager
+    def open_channel(self, stream_id: str, preview_width: int = PREVIEW_WIDTH):
+        """Register a channel for the length of a tracker run"""
+        channel = StreamChannel(stream_id, self.encoder, preview_width)
+        self.httpd.channels[stream_id] = channel
+        try:
+            yield channel
+        finally:
+            if self.httpd.channels.get(stream_id) is channel:
+                del self.httpd.channels[stream_id]
+            channel.close()
+
+    def url(self, stream_id: str) -> str:
+        return f"{self.base_url}/stream/{stream_id}"
+
+    def img_tag(self, stream_id: str) -> str:
+        # Paramètre horodaté pour que le navigateur rouvre le flux à chaque session
+        return f'<img src="{self.url(stream_id)}?t={int(time.time() * 1000)}" style="width: 100%;" />'
+
+
+_stream_server = None
+_stream_server_lock = threading.Lock()
+
+
+def get_stream_server() -> StreamServer:
+    """Process-wide MJPEG server, started on first use"""
+    global _stream_server
+    with _stream_server_lock:
+        if _stream_server is None:
+            _stream_server = StreamServer()
+        return _stream_server